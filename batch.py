@@ -0,0 +1,214 @@
+# batch.py
+# Headless batch mode: upload -> QC -> run -> wait -> fetch results for many datasets, without the GUI.
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from dicom_scan import scan_dataset
+from sdk_client import SDKClient, qc_outcome, result_file_name, RESULT_EXTENSIONS
+from storage import (
+    get_api_key, add_job, get_job, update_job_field, add_fingerprint, find_fingerprint, is_terminal_status
+)
+
+PRODUCT = "Atypical/MSAp/PSP-v1.0"
+
+_print_lock = threading.Lock()
+
+def log(dataset_id, message):
+    with _print_lock:
+        print(f"[{datetime.now():%H:%M:%S}] {dataset_id}: {message}", flush=True)
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="main.py batch",
+        description="Upload DICOM datasets, run neuropacs jobs and save their results, without the GUI.",
+    )
+    parser.add_argument("--input", required=True, help="file listing one dataset directory per line ('-' for stdin)")
+    parser.add_argument("--format", default="JSON", type=str.upper, choices=sorted(RESULT_EXTENSIONS), help="results format")
+    parser.add_argument("--out", required=True, help="directory for the results and summary.json")
+    parser.add_argument("--workers", type=int, default=4, help="datasets processed concurrently (default: 4)")
+    parser.add_argument("--api-key", help="API key (default: $NEUROPACS_API_KEY, then the key saved by the GUI)")
+    parser.add_argument("--qc", action="store_true", help="wait for QC to pass before running each job")
+    parser.add_argument("--qc-timeout", type=float, default=300, help="seconds to wait for QC (default: 300)")
+    parser.add_argument("--poll-interval", type=float, default=30, help="seconds between status checks (default: 30)")
+    parser.add_argument("--timeout", type=float, default=6 * 3600, help="seconds to wait for each job to finish (default: 6 hours)")
+    parser.add_argument("--reupload", action="store_true", help="upload datasets again even if they were uploaded before")
+    parser.add_argument("--summary", help="path of the summary (default: <out>/summary.json)")
+    return parser.parse_args(argv)
+
+def read_dataset_paths(input_path):
+    """Dataset directories listed in input_path, one per line; blank lines and # comments are skipped."""
+    f = sys.stdin if input_path == "-" else open(input_path, "r")
+    try:
+        lines = [line.strip() for line in f]
+    finally:
+        if f is not sys.stdin:
+            f.close()
+    return [line for line in lines if line and not line.startswith("#")]
+
+def wait_for_qc(sdk_client, order_id, timeout, poll_interval):
+    """Poll QC until it passes or fails; a timeout counts as a failure, like in the GUI."""
+    deadline = time.monotonic() + timeout
+    while True:
+        outcome = qc_outcome(sdk_client.qcCheck(order_id))
+        if outcome is not None:
+            return outcome
+        if time.monotonic() >= deadline:
+            return "FAIL"
+        time.sleep(min(poll_interval, max(deadline - time.monotonic(), 0)))
+
+def wait_for_job(sdk_client, order_id, timeout, poll_interval):
+    """Poll the job status until it finishes or fails; returns the last status seen."""
+    deadline = time.monotonic() + timeout
+    while True:
+        status = sdk_client.checkStatus(order_id, max_age=0)
+        if is_terminal_status(status) or time.monotonic() >= deadline:
+            return status
+        time.sleep(min(poll_interval, max(deadline - time.monotonic(), 0)))
+
+def save_results(sdk_client, order_id, dataset_id, format, out_dir):
+    results = sdk_client.getResults(order_id, format)
+    result_path = os.path.join(out_dir, result_file_name(dataset_id, order_id, format))
+    if format == "PNG":
+        with open(result_path, "wb") as f:
+            f.write(results.getvalue())
+    else:
+        with open(result_path, "w", encoding="utf-8") as f:
+            f.write(results)
+    return result_path
+
+def reusable_job(matches):
+    """
+    The stored job of the newest earlier upload (from find_fingerprint) that
+    can be picked up again, i.e. did not fail QC or processing. Uploads with
+    no job stored here are not reused: nothing tells how far they got.
+    """
+    for match in reversed(matches):
+        job = get_job(match["order_id"])
+        if job is None or job["qc"] == "FAIL" or job["last_status"] == "QC failed":
+            continue
+        if is_terminal_status(job["last_status"]) and job["last_status"] != "Finished":
+            continue
+        return job
+    return None
+
+def process_dataset(sdk_client, dataset_path, args):
+    """Run one dataset through the whole workflow and return its summary entry."""
+    dataset_id = os.path.basename(os.path.normpath(dataset_path))
+    entry = {
+        "dataset_path": dataset_path,
+        "dataset_id": dataset_id,
+        "order_id": None,
+        "reused": False,
+        "qc": None,
+        "status": None,
+        "result_path": None,
+        "error": None,
+    }
+    start = time.monotonic()
+    try:
+        if not os.path.isdir(dataset_path):
+            raise ValueError("Not a directory")
+        manifest = scan_dataset(dataset_path)
+        if not manifest.files:
+            raise ValueError("No DICOM files found")
+        log(dataset_id, manifest.summary())
+        fingerprint = manifest.fingerprint()
+
+        job = None if args.reupload else reusable_job(find_fingerprint(fingerprint))
+        if job is not None:
+            order_id = job["order_id"]
+            entry.update(order_id=order_id, reused=True)
+            log(dataset_id, f"already uploaded as {order_id}, reusing it")
+        else:
+            order_id = sdk_client.newJob()
+            entry["order_id"] = order_id
+            log(dataset_id, f"uploading as {order_id}")
+            sdk_client.upload(
+                order_id, dataset_path, lambda bytes_done, bytes_total: None, manifest=manifest,
+                status_callback=lambda message: log(dataset_id, message),
+            )
+            add_fingerprint(fingerprint, order_id, dataset_path, str(datetime.now()))
+            add_job(order_id, dataset_id, PRODUCT, "IP" if args.qc else "NA", str(datetime.now()))
+            job = get_job(order_id)
+
+        # "Started" until runJob went through: a new upload, or an earlier run interrupted before its job started
+        if job["last_status"] == "Started":
+            if args.qc and job["qc"] != "PASS":
+                log(dataset_id, "waiting for QC")
+                entry["qc"] = wait_for_qc(sdk_client, order_id, args.qc_timeout, args.poll_interval)
+                update_job_field(order_id, "qc", entry["qc"])
+                if entry["qc"] != "PASS":
+                    update_job_field(order_id, "last_status", "QC failed")
+                    entry["status"] = "QC failed"
+                    raise ValueError("QC failed or timed out")
+            sdk_client.runJob(order_id)
+            update_job_field(order_id, "last_status", "0% - Initializing")
+            log(dataset_id, "job started")
+        else:
+            entry["qc"] = job["qc"]
+
+        status = wait_for_job(sdk_client, order_id, args.timeout, args.poll_interval)
+        entry["status"] = status
+        update_job_field(order_id, "last_status", status)
+        if status != "Finished":
+            raise ValueError(f"Job did not finish: {status}")
+        entry["result_path"] = save_results(sdk_client, order_id, dataset_id, args.format, args.out)
+        log(dataset_id, f"results saved to {entry['result_path']}")
+    except Exception as e:
+        entry["error"] = str(e)
+        log(dataset_id, f"failed: {e}")
+    entry["elapsed"] = round(time.monotonic() - start, 1)
+    return entry
+
+def write_summary(summary, summary_path):
+    tmp_path = summary_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(summary, f, indent=2)
+    os.replace(tmp_path, summary_path)
+
+def main(argv):
+    """
+    Entry point of `main.py batch`. Exits with 0 if every dataset finished,
+    1 if any failed and 2 if the batch could not start at all.
+    """
+    args = parse_args(argv)
+    api_key = args.api_key or os.environ.get("NEUROPACS_API_KEY") or get_api_key()
+    if not api_key:
+        print("No API key: pass --api-key, set NEUROPACS_API_KEY or connect once in the GUI.", file=sys.stderr)
+        return 2
+    try:
+        dataset_paths = read_dataset_paths(args.input)
+    except OSError as e:
+        print(f"Cannot read {args.input}: {e}", file=sys.stderr)
+        return 2
+    os.makedirs(args.out, exist_ok=True)
+
+    sdk_client = SDKClient()
+    try:
+        sdk_client.connect(api_key)
+    except Exception as e:
+        print(f"Connection failed: {e}", file=sys.stderr)
+        return 2
+
+    started = str(datetime.now())
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        entries = list(pool.map(lambda path: process_dataset(sdk_client, path, args), dataset_paths))
+
+    failed = sum(1 for entry in entries if entry["error"] is not None)
+    summary = {
+        "started": started,
+        "finished": str(datetime.now()),
+        "format": args.format,
+        "datasets": entries,
+        "succeeded": len(entries) - failed,
+        "failed": failed,
+    }
+    summary_path = args.summary or os.path.join(args.out, "summary.json")
+    write_summary(summary, summary_path)
+    print(f"{len(entries) - failed}/{len(entries)} datasets finished; summary written to {summary_path}")
+    return 1 if failed else 0
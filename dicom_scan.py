@@ -0,0 +1,172 @@
+# dicom_scan.py
+# Header-only pre-scan of a dataset directory before upload.
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from storage import get_scan_cache, put_scan_cache
+
+# Media Storage SOP Class of DICOMDIR index files, which are not images
+DICOMDIR_SOP_CLASS_UID = "1.2.840.10008.1.3.10"
+
+# The only header elements the scan needs; everything else (and the pixel data) is skipped
+HEADER_TAGS = ["SOPClassUID", "SOPInstanceUID", "SeriesInstanceUID", "SeriesDescription", "Modality"]
+
+class DicomFile:
+    """A DICOM instance found by the scan."""
+    def __init__(self, path, size, sop_instance_uid, series_instance_uid):
+        self.path = path
+        self.size = size
+        self.sop_instance_uid = sop_instance_uid
+        self.series_instance_uid = series_instance_uid
+
+class DatasetManifest:
+    """
+    The files of a dataset worth uploading, plus what was left out and why.
+    series maps SeriesInstanceUID -> {"description", "modality", "files", "bytes"}.
+    """
+    def __init__(self, dataset_path):
+        self.dataset_path = dataset_path
+        self.files = []        # DicomFile, one per unique SOPInstanceUID
+        self.non_dicom = []    # paths that are not DICOM instances (thumbnails, reports, DICOMDIR...)
+        self.duplicates = []   # paths repeating an SOPInstanceUID already in files
+        self.series = {}
+
+    @property
+    def total_bytes(self):
+        return sum(dicom_file.size for dicom_file in self.files)
+
+    def paths(self):
+        return [dicom_file.path for dicom_file in self.files]
+
+    def fingerprint(self):
+        """
+        Merkle-style fingerprint of the dataset: a hash per series over its sorted
+        SOPInstanceUIDs, then a hash over the sorted series hashes. It depends only
+        on which instances the dataset holds, not on file names or layout.
+        """
+        series_uids = {}
+        for dicom_file in self.files:
+            series_uids.setdefault(dicom_file.series_instance_uid, []).append(dicom_file.sop_instance_uid)
+        series_hashes = sorted(
+            hashlib.sha256("\n".join(sorted(uids)).encode()).hexdigest() for uids in series_uids.values()
+        )
+        return hashlib.sha256("\n".join(series_hashes).encode()).hexdigest()
+
+    def summary(self):
+        return (
+            f"{len(self.files)} DICOM files in {len(self.series)} series ({self.total_bytes} bytes); "
+            f"skipped {len(self.non_dicom)} non-DICOM and {len(self.duplicates)} duplicate files"
+        )
+
+def read_header(path):
+    """
+    Read only the identifying header elements of a file.
+    Returns the dataset, or None if the file is not a DICOM instance.
+    """
+    # pydicom is only needed once a dataset is scanned, not at startup
+    import pydicom
+    from pydicom.errors import InvalidDicomError
+    try:
+        ds = pydicom.dcmread(path, stop_before_pixels=True, defer_size=1024, specific_tags=HEADER_TAGS)
+    except InvalidDicomError:
+        # Some exporters omit the preamble; accept those only if they look like an instance
+        try:
+            ds = pydicom.dcmread(path, stop_before_pixels=True, defer_size=1024, specific_tags=HEADER_TAGS, force=True)
+        except Exception:
+            return None
+        if "SOPClassUID" not in ds:
+            return None
+    except Exception:
+        return None
+
+    media_sop_class = getattr(getattr(ds, "file_meta", None), "MediaStorageSOPClassUID", None)
+    if media_sop_class == DICOMDIR_SOP_CLASS_UID or "SOPInstanceUID" not in ds:
+        return None
+    return ds
+
+def scan_file(path):
+    """
+    Read the header of one file and return it as a scan_cache row.
+    sop_instance_uid is None if the file is not a DICOM instance.
+    """
+    st = os.stat(path)
+    ds = read_header(path)
+    return {
+        "path": path,
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "sop_instance_uid": str(ds.SOPInstanceUID) if ds is not None else None,
+        "series_instance_uid": str(ds.get("SeriesInstanceUID", "")) if ds is not None else None,
+        "series_description": str(ds.get("SeriesDescription", "")) if ds is not None else None,
+        "modality": str(ds.get("Modality", "")) if ds is not None else None,
+    }
+
+def scan_dataset(dataset_path, max_workers=8):
+    """
+    Scan every file under dataset_path, reading headers in parallel, and
+    return a DatasetManifest of the unique DICOM instances.
+    Header scans are cached by path, mtime and size, so rescanning an
+    unchanged directory reads no file contents at all.
+    """
+    paths = []
+    for dirpath, _, filenames in os.walk(dataset_path):
+        for filename in filenames:
+            paths.append(os.path.join(dirpath, filename))
+    paths.sort()
+
+    cached = get_scan_cache(paths)
+    rows = {}
+    to_scan = []
+    for path in paths:
+        row = cached.get(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        if row is not None and row["mtime_ns"] == st.st_mtime_ns and row["size"] == st.st_size:
+            rows[path] = row
+        else:
+            to_scan.append(path)
+    if to_scan:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            scanned = list(pool.map(scan_file, to_scan))
+        put_scan_cache(scanned)
+        rows.update((row["path"], row) for row in scanned)
+
+    manifest = DatasetManifest(dataset_path)
+    seen_uids = set()
+    for path in paths:
+        row = rows.get(path)
+        if row is None:
+            continue
+        if row["sop_instance_uid"] is None:
+            manifest.non_dicom.append(path)
+            continue
+        if row["sop_instance_uid"] in seen_uids:
+            manifest.duplicates.append(path)
+            continue
+        seen_uids.add(row["sop_instance_uid"])
+
+        manifest.files.append(DicomFile(path, row["size"], row["sop_instance_uid"], row["series_instance_uid"]))
+        series = manifest.series.setdefault(row["series_instance_uid"], {
+            "description": row["series_description"],
+            "modality": row["modality"],
+            "files": 0,
+            "bytes": 0,
+        })
+        series["files"] += 1
+        series["bytes"] += row["size"]
+    return manifest
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """SHA-256 hex digest of a file, read in fixed-size chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def hash_files(paths, max_workers=8):
+    """SHA-256 digests of many files, computed in parallel, in the order of paths."""
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(file_sha256, paths))
@@ -0,0 +1,141 @@
+# results_cache.py
+# On-disk, content-addressed cache of job results with LRU eviction.
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from storage import get_app_data_dir
+
+# Default upper bound on the total size of cached results.
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+class ResultsCache:
+    """
+    Stores the raw bytes of results keyed by (order_id, format).
+    Blobs are named by their SHA-256 so identical results are stored once;
+    index.json records which key points at which blob, least recently used first.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or os.path.join(get_app_data_dir(), "results_cache")
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(self.cache_dir, "index.json")
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._index = self._load_index()  # "order_id/format" -> {"hash": str, "size": int}
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, "r") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return OrderedDict()
+        # Drop entries whose blob went missing
+        return OrderedDict((key, entry) for key, entry in entries if os.path.exists(self._blob_path(entry["hash"])))
+
+    def _save_index(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(list(self._index.items()), f)
+        os.replace(tmp_path, self.index_path)
+
+    def _key(self, order_id, format):
+        return f"{order_id}/{format.upper()}"
+
+    def _blob_path(self, digest):
+        return os.path.join(self.cache_dir, digest[:2], digest)
+
+    def _total_bytes(self):
+        # Blobs shared by several keys are only counted once
+        return sum({entry["hash"]: entry["size"] for entry in self._index.values()}.values())
+
+    def _remove_entry(self, key):
+        entry = self._index.pop(key)
+        if not any(other["hash"] == entry["hash"] for other in self._index.values()):
+            try:
+                os.remove(self._blob_path(entry["hash"]))
+            except OSError:
+                pass
+
+    def thumbnail_path(self, order_id):
+        """Path of the preview thumbnail of an order's image results (which may not exist yet)."""
+        return os.path.join(self.cache_dir, "thumbnails", re.sub(r"[^A-Za-z0-9_.-]", "_", order_id) + ".png")
+
+    def path(self, order_id, format):
+        """Return the path of the cached blob for (order_id, format), or None."""
+        with self._lock:
+            entry = self._index.get(self._key(order_id, format))
+            return self._blob_path(entry["hash"]) if entry else None
+
+    def get(self, order_id, format):
+        """
+        Return the cached bytes for (order_id, format), or None on a miss.
+        Large results are better read from path() than loaded whole.
+        """
+        with self._lock:
+            key = self._key(order_id, format)
+            entry = self._index.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            try:
+                with open(self._blob_path(entry["hash"]), "rb") as f:
+                    data = f.read()
+            except OSError:
+                self._remove_entry(key)
+                self._save_index()
+                self.misses += 1
+                return None
+            self._index.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, order_id, format, data):
+        """Store the raw bytes of a result, evicting least recently used entries past max_bytes."""
+        digest = hashlib.sha256(data).hexdigest()
+        blob_path = self._blob_path(digest)
+        with self._lock:
+            if not os.path.exists(blob_path):
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                tmp_path = blob_path + ".tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, blob_path)
+            key = self._key(order_id, format)
+            self._index[key] = {"hash": digest, "size": len(data)}
+            self._index.move_to_end(key)
+            while len(self._index) > 1 and self._total_bytes() > self.max_bytes:
+                self._remove_entry(next(iter(self._index)))
+            self._save_index()
+
+    def purge(self, order_id=None):
+        """Remove the cached results of one order, or of every order if order_id is None."""
+        with self._lock:
+            for key in list(self._index):
+                if order_id is None or key.rsplit("/", 1)[0] == order_id:
+                    self._remove_entry(key)
+            self._save_index()
+            if order_id is not None:
+                thumbnails = [self.thumbnail_path(order_id)]
+            else:
+                thumbnail_dir = os.path.join(self.cache_dir, "thumbnails")
+                thumbnails = [os.path.join(thumbnail_dir, name) for name in os.listdir(thumbnail_dir)] if os.path.isdir(thumbnail_dir) else []
+            for thumbnail in thumbnails:
+                try:
+                    os.remove(thumbnail)
+                except OSError:
+                    pass
+
+    def stats(self):
+        """Return hit/miss counters and the size of the cache."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._index),
+                "bytes": self._total_bytes(),
+            }
@@ -1,47 +1,472 @@
 # sdk_client.py
 # neuropacs client interface
-import neuropacs
+import csv
+import io
 import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from results_cache import ResultsCache
+from datetime import datetime
+from dicom_scan import scan_dataset, hash_files
+from storage import is_terminal_status, create_upload, get_upload, mark_part_uploaded, remove_upload
+
+# Upper bound on the bytes of packed archives waiting for, or being sent over, the network
+UPLOAD_MEMORY_CAP = 64 * 1024 * 1024
+
+# Bytes the HTTP layer reads between two upload progress reports
+PROGRESS_STEP = 256 * 1024
+
+# The neuropacs release the upload path is written against: it drives the SDK's private
+# multipart upload methods (_upload_zip), which any other release may rename or change
+SDK_VERSION = "1.8.6"
+SDK_UPLOAD_METHODS = ("_Neuropacs__new_multipart_upload", "_Neuropacs__upload_part", "_Neuropacs__complete_multipart_upload")
+
+# Attempts at sending one upload part, and seconds between them (as the SDK's own retry)
+UPLOAD_PART_ATTEMPTS = 3
+UPLOAD_PART_RETRY_DELAY = 1
+
+# Substrings of SDK error messages that are worth retrying (network hiccups, throttling)
+TRANSIENT_ERRORS = ("Connection", "timed out", "Timeout", "Max retries", "429", "502", "503", "504")
+
+# File extension of each results format
+RESULT_EXTENSIONS = {"PNG": "png", "JSON": "json", "TXT": "txt", "XML": "xml"}
+
+# Name of the manifest export_results writes next to (or into) the exported results
+EXPORT_MANIFEST = "manifest.csv"
+EXPORT_MANIFEST_FIELDS = ("order_id", "dataset_id", "format", "file", "status", "bytes", "error")
+
+class UnsupportedSDK(RuntimeError):
+    """The installed neuropacs lacks what the upload path relies on."""
+
+def check_sdk(neuropacs):
+    """Raise UnsupportedSDK unless the neuropacs module provides the private upload methods used by _upload_zip."""
+    missing = [name for name in SDK_UPLOAD_METHODS if not hasattr(neuropacs.Neuropacs, name)]
+    if not missing and not hasattr(neuropacs.Neuropacs._Neuropacs__upload_part, "__wrapped__"):
+        missing.append("_Neuropacs__upload_part.__wrapped__")
+    if missing:
+        version = getattr(neuropacs, "PACKAGE_VERSION", "unknown")
+        raise UnsupportedSDK(
+            f"neuropacs {version} is not supported (missing {', '.join(missing)}); "
+            f"install neuropacs=={SDK_VERSION}"
+        )
+
+class CheckCancelled(Exception):
+    """Reported by check_status_many for the orders left unchecked after it was cancelled."""
+
+def is_transient_error(e):
+    message = str(e)
+    return any(marker in message for marker in TRANSIENT_ERRORS)
+
+def unique_name(name_set, filename):
+    """
+    Return filename, or filename with a _1, _2... suffix if it is already in
+    name_set (scanners often reuse file names across series), and record it.
+    """
+    base_name, extension = os.path.splitext(filename)
+    new_name = filename
+    counter = 1
+    while new_name in name_set:
+        new_name = f"{base_name}_{counter}{extension}"
+        counter += 1
+    name_set.add(new_name)
+    return new_name
+
+def result_file_name(dataset_id, order_id, format):
+    """File name results of an order are saved under, e.g. by batch mode and export_results."""
+    return f"{dataset_id}_{order_id}.{RESULT_EXTENSIONS[format]}"
+
+def qc_outcome(qc_results):
+    """
+    Interpret a qcCheck() result: "PASS" or "FAIL" once QC is done, None while it is still running.
+    """
+    if isinstance(qc_results, (list, tuple)) and len(qc_results) >= 12:
+        status = qc_results[11]["Status"]
+        return status if status in ("PASS", "FAIL") else None
+    if isinstance(qc_results, dict) and qc_results.get("status") is not None:
+        return "FAIL"
+    return None
+
+class UploadArchive:
+    """
+    A zip archive of dataset files being packed for upload. Archives are built
+    in memory, except those holding a single file larger than max_zip_size,
+    which are spooled to a temporary file so their size never shows up in RSS.
+    """
+    def __init__(self, zip_index, on_disk=False):
+        self.zip_index = zip_index
+        self.on_disk = on_disk
+        self.buffer = tempfile.TemporaryFile() if on_disk else io.BytesIO()
+        self.zip_file = zipfile.ZipFile(self.buffer, "w", zipfile.ZIP_DEFLATED)
+        self.paths = []
+        self.source_bytes = 0  # size of the files in the archive, before compression
+
+    def add(self, path, archive_name, size):
+        # ZipFile.write copies the file in fixed-size chunks, never reading it whole
+        self.zip_file.write(path, archive_name)
+        self.paths.append(path)
+        self.source_bytes += size
+
+    def size(self):
+        return self.buffer.tell()
+
+    def memory_bytes(self):
+        """Bytes of memory the finished archive holds until it is sent."""
+        return 0 if self.on_disk else self.length
+
+    def finish(self):
+        self.zip_file.close()
+        self.length = self.buffer.tell()
+        self.buffer.seek(0)
+
+    def close(self):
+        self.zip_file.close()  # no-op once finished
+        self.buffer.close()
+
+class ProgressReader:
+    """
+    File-like view of a packed archive for requests to stream as a request body.
+    callback(bytes_read) is called as the HTTP layer reads it.
+    """
+    def __init__(self, fileobj, length, callback):
+        self.fileobj = fileobj
+        self.length = length
+        self.callback = callback
+
+    def __len__(self):
+        return self.length
+
+    def read(self, size=-1):
+        data = self.fileobj.read(size)
+        self.callback(self.fileobj.tell())
+        return data
+
+    def tell(self):
+        return self.fileobj.tell()
+
+    def seek(self, offset, whence=0):
+        return self.fileobj.seek(offset, whence)
 
 class SDKClient:
     def __init__(self):
         self.api_key = None
         self.npcs = None
-        self.server_url = "https://jdfkdttvlf.execute-api.us-east-1.amazonaws.com/prod"
-        
+        # NEUROPACS_SERVER_URL points the client at another deployment (e.g. a local stand-in for testing)
+        self.server_url = os.environ.get("NEUROPACS_SERVER_URL", "https://jdfkdttvlf.execute-api.us-east-1.amazonaws.com/prod")
+        self.session = None  # TimedSession, created on the first connect (requests is slow to import)
+        self._connect_lock = threading.Lock()
+        self.results_cache = ResultsCache()
+        self.status_ttl = 30  # seconds a non-terminal status is reused before polling again
+        self._status_cache = {}  # order_id -> (status, time.monotonic() when fetched)
+        self._status_lock = threading.Lock()
 
     def connect(self, api_key):
-        self.npcs = neuropacs.init(server_url=self.server_url, api_key=api_key, origin_type="neuropacsGUI")
-        try:
-            conn = self.npcs.connect()
-            print(conn)
+        """
+        Connect with the given API key. Safe to call from a background thread:
+        other calls wait for a connect in progress instead of failing.
+        """
+        with self._connect_lock:
+            # neuropacs and its crypto stack are slow to import, so that is left until the first connect
+            import neuropacs
+            check_sdk(neuropacs)
+            if self.session is None:
+                from timed_session import TimedSession
+                self.session = TimedSession()
+            # neuropacs calls requests.get/post/put directly; route them through one pooled session
+            neuropacs.sdk.requests = self.session
+            npcs = neuropacs.init(server_url=self.server_url, api_key=api_key, origin_type="neuropacsGUI")
+            try:
+                conn = npcs.connect()
+                print(conn)
+            except Exception as e:
+                print(str(e))
+                raise ValueError("Invalid API Key")
+            self.npcs = npcs
+            if api_key != self.api_key:
+                # Cached statuses belong to the previous key's jobs
+                self.invalidate_status()
             self.api_key = api_key
             return True
-        except Exception as e:
-            print(str(e))
-            raise ValueError("Invalid API Key")
-            
+
+    def _client(self):
+        """Return the connected neuropacs client, waiting for a connect() in progress."""
+        with self._connect_lock:
+            if self.npcs is None:
+                raise ValueError("Not connected")
+            return self.npcs
+
+    def request_stats(self):
+        """Return {endpoint: (count, mean ms, max ms)} for the requests made so far."""
+        if self.session is None:
+            return {}
+        with self.session._latency_lock:
+            return {
+                endpoint: (count, total / count * 1000, worst * 1000)
+                for endpoint, (count, total, worst) in self.session.latency.items()
+            }
+
     def newJob(self):
-        order_id = self.npcs.new_job()
-        return order_id        
+        order_id = self._client().new_job()
+        return order_id
+
+    def upload(self, order_id, dataset_path, progress_callback, manifest=None, checkpoint=None, status_callback=None):
+        """
+        Upload the DICOM instances of a dataset directory. Non-DICOM files and
+        duplicate instances are left out; pass the DatasetManifest if the
+        directory was already scanned.
+
+        progress_callback(bytes_done, bytes_total) reports the bytes of dataset
+        files sent so far. checkpoint() is called before each file is packed; it
+        may block to pause the upload or raise to abort it (see upload_files).
+        status_callback(message), if given, is told what a scan made here found
+        in the dataset, or that an earlier upload is being resumed.
+
+        Uploads are resumable: the file manifest (paths, sizes, SHA-256) and each
+        zip archive the backend accepts are recorded in storage, so calling upload
+        again for the same order_id after a failure or restart only sends the
+        files that were not accepted yet.
+        """
+        upload = get_upload(order_id)
+        if upload is None:
+            if manifest is None:
+                manifest = scan_dataset(dataset_path)
+                if status_callback is not None:
+                    status_callback(manifest.summary())
+            if not manifest.files:
+                raise ValueError(f"No DICOM files found in {dataset_path}")
+            paths = manifest.paths()
+            files = list(zip(paths, [dicom_file.size for dicom_file in manifest.files], hash_files(paths)))
+            create_upload(order_id, dataset_path, files, created=str(datetime.now()))
+            upload = get_upload(order_id)
+        else:
+            self._verify_upload(upload)
+
+        files_total = len(upload["files"])
+        files_accepted = sum(1 for file in upload["files"] if file["zip_index"] is not None)
+        bytes_total = sum(file["size"] for file in upload["files"])
+        bytes_accepted = sum(file["size"] for file in upload["files"] if file["zip_index"] is not None)
+        pending = [file["path"] for file in upload["files"] if file["zip_index"] is None]
+        if files_accepted and status_callback is not None:
+            status_callback(f"Resuming upload: {files_accepted}/{files_total} files already accepted")
 
-    def upload(self, order_id, dataset_path, progress_callback):
-        self.npcs.upload_dataset_from_path(order_id=order_id, path=dataset_path, callback=lambda data: progress_callback(data['progress']))
+        def on_progress(bytes_sent, _):
+            progress_callback(bytes_accepted + bytes_sent, bytes_total)
+
+        # Archive names are assigned over the whole dataset so resumed parts never reuse a name
+        name_set = set()
+        archive_names = {file["path"]: unique_name(name_set, os.path.basename(file["path"])) for file in upload["files"]}
+
+        if pending:
+            self.upload_files(
+                order_id, pending, on_progress,
+                start_zip_index=upload["next_zip_index"],
+                archive_names=archive_names,
+                on_part_uploaded=lambda zip_index, paths: mark_part_uploaded(order_id, zip_index, paths),
+                checkpoint=checkpoint,
+            )
+        else:
+            progress_callback(bytes_total, bytes_total)
+        remove_upload(order_id)
         return True
 
+    def _verify_upload(self, upload):
+        """Make sure the files still to be sent did not change since the upload started."""
+        pending = [file for file in upload["files"] if file["zip_index"] is None]
+        for file in pending:
+            if not os.path.isfile(file["path"]) or os.path.getsize(file["path"]) != file["size"]:
+                raise ValueError(f"{file['path']} changed since the upload started; start a new upload instead.")
+        for file, sha256 in zip(pending, hash_files([file["path"] for file in pending])):
+            if sha256 != file["sha256"]:
+                raise ValueError(f"{file['path']} changed since the upload started; start a new upload instead.")
+
+    def upload_files(self, order_id, file_paths, progress_callback, start_zip_index=0, on_part_uploaded=None,
+                     archive_names=None, checkpoint=None, memory_cap=UPLOAD_MEMORY_CAP):
+        """
+        Upload the given files, packed into zip archives of up to max_zip_size
+        bytes like upload_dataset_from_path does, through the SDK's multipart
+        upload requests. on_part_uploaded(zip_index, paths) is called once each
+        archive is accepted. archive_names maps a path to its name inside the
+        archives (default: the file name, made unique).
+
+        Archives are packed on a background thread while the calling thread
+        streams the previous ones to the network. Packing waits while more than
+        memory_cap bytes of archives are queued or in flight, so memory use
+        stays flat however large the dataset is.
+
+        progress_callback(bytes_sent, bytes_total) reports the bytes of the given
+        files sent so far, from the calling thread. checkpoint(), if given, is
+        called on the packing thread before each file: blocking in it pauses the
+        upload once the archives already packed are sent, and an exception
+        raised by it is re-raised here.
+        """
+        npcs = self._client()
+        if archive_names is None:
+            name_set = set()
+            archive_names = {path: unique_name(name_set, os.path.basename(path)) for path in file_paths}
+        sizes = {path: os.path.getsize(path) for path in file_paths}
+        bytes_total = sum(sizes.values())
+
+        condition = threading.Condition()
+        ready = deque()  # (archive, final) or (exception, None), in upload order
+        state = {"in_flight": 0, "stopped": False}
+
+        def hand_over(archive, final):
+            archive.finish()
+            with condition:
+                # Back-pressure: wait until the network side has caught up
+                condition.wait_for(lambda: state["stopped"] or state["in_flight"] == 0
+                                   or state["in_flight"] + archive.memory_bytes() <= memory_cap)
+                if state["stopped"]:
+                    archive.close()
+                    return False
+                state["in_flight"] += archive.memory_bytes()
+                ready.append((archive, final))
+                condition.notify_all()
+            return True
+
+        def pack():
+            archive = None
+            try:
+                zip_index = start_zip_index
+                for file_path in file_paths:
+                    if checkpoint is not None:
+                        checkpoint()
+                    size = sizes[file_path]
+                    if archive is not None and (archive.size() > npcs.max_zip_size or size > npcs.max_zip_size):
+                        if not hand_over(archive, final=False):
+                            return
+                        archive = None
+                        zip_index += 1
+                    if archive is None:
+                        archive = UploadArchive(zip_index, on_disk=size > npcs.max_zip_size)
+                    archive.add(file_path, archive_names[file_path], size)
+                hand_over(archive, final=True)
+            except BaseException as e:
+                if archive is not None:
+                    archive.close()
+                with condition:
+                    ready.append((e, None))
+                    condition.notify_all()
+
+        packer = threading.Thread(target=pack, name=f"upload-packer-{order_id}", daemon=True)
+        packer.start()
+        bytes_sent = 0
+        try:
+            while True:
+                with condition:
+                    condition.wait_for(lambda: ready)
+                    archive, final = ready.popleft()
+                if isinstance(archive, BaseException):
+                    raise archive
+                try:
+                    last_report = [0]
+
+                    def on_read(position, archive=archive, last_report=last_report):
+                        if position - last_report[0] >= PROGRESS_STEP:
+                            last_report[0] = position
+                            # Compressed bytes read are mapped back onto the files' own sizes
+                            progress_callback(bytes_sent + archive.source_bytes * position // archive.length, bytes_total)
+
+                    self._upload_zip(order_id, archive.zip_index, ProgressReader(archive.buffer, archive.length, on_read), final)
+                finally:
+                    archive.close()
+                    with condition:
+                        state["in_flight"] -= archive.memory_bytes()
+                        condition.notify_all()
+                bytes_sent += archive.source_bytes
+                progress_callback(bytes_sent, bytes_total)
+                if on_part_uploaded is not None:
+                    on_part_uploaded(archive.zip_index, archive.paths)
+                if final:
+                    return True
+        finally:
+            with condition:
+                state["stopped"] = True
+                condition.notify_all()
+                # Archives packed ahead of a failed upload are dropped
+                for archive, _ in ready:
+                    if isinstance(archive, UploadArchive):
+                        archive.close()
+                ready.clear()
+
+    def _upload_zip(self, order_id, zip_index, zip_data, final):
+        """
+        Upload one zip archive of dataset files, given as a readable file-like
+        object, which requests streams instead of holding a second copy.
+        neuropacs only exposes a whole-directory upload, so this drives its
+        multipart requests directly. This is the only method that talks to the
+        upload endpoint, so tests can replace it with a local stand-in.
+        """
+        npcs = self._client()
+        part_number = zip_index + 1
+        upload_id = npcs._Neuropacs__new_multipart_upload(order_id, str(zip_index), order_id)
+        # The SDK's retry would resend the stream from where the failed attempt left it (at EOF: an
+        # empty part the backend accepts), so retry here around the undecorated call, rewinding first
+        upload_part = type(npcs)._Neuropacs__upload_part.__wrapped__
+        for attempt in range(UPLOAD_PART_ATTEMPTS):
+            zip_data.seek(0)
+            try:
+                e_tag = upload_part(npcs, upload_id, order_id, str(zip_index), order_id, part_number, zip_data)
+                break
+            except Exception:
+                if attempt == UPLOAD_PART_ATTEMPTS - 1:
+                    raise
+                time.sleep(UPLOAD_PART_RETRY_DELAY)
+        npcs._Neuropacs__complete_multipart_upload(
+            order_id, order_id, str(zip_index), upload_id, [{'PartNumber': part_number, 'ETag': e_tag}], 1 if final else 0
+        )
+
     def runJob(self, order_id):
-        self.npcs.run_job(order_id=order_id, product_name="Atypical/MSAp/PSP-v1.0")
+        self._client().run_job(order_id=order_id, product_name="Atypical/MSAp/PSP-v1.0")
+        self.invalidate_status(order_id)
         return True
     
     def qcCheck(self, order_id):
-        qc_results = self.npcs.qc_check(order_id=order_id, format="JSON")
+        qc_results = self._client().qc_check(order_id=order_id, format="JSON")
         return json.loads(qc_results)
         # if json.loads(qc_results)[11]["Status"] == "PASS":
         #     return True
         # return False
 
-    def checkStatus(self, order_id):
-        status = self.npcs.check_status(order_id=order_id)
+    def checkStatus(self, order_id, max_age=None):
+        """
+        Return the job status, reusing a cached value when possible: terminal
+        statuses (Finished/Failed) are kept forever, others for status_ttl seconds.
+        max_age overrides status_ttl; max_age=0 forces a fresh check of a running job.
+        """
+        ttl = self.status_ttl if max_age is None else max_age
+        with self._status_lock:
+            cached = self._status_cache.get(order_id)
+        if cached is not None:
+            status, fetched_at = cached
+            if is_terminal_status(status) or time.monotonic() - fetched_at < ttl:
+                return status
+        status = self._fetch_status(order_id)
+        with self._status_lock:
+            self._status_cache[order_id] = (status, time.monotonic())
+        return status
+
+    def prime_status(self, order_id, status):
+        """Seed the status cache with a terminal status already known locally (e.g. from storage)."""
+        if is_terminal_status(status):
+            with self._status_lock:
+                self._status_cache[order_id] = (status, time.monotonic())
+
+    def invalidate_status(self, order_id=None):
+        """Forget the cached status of one order, or of every order if order_id is None."""
+        with self._status_lock:
+            if order_id is None:
+                self._status_cache.clear()
+            else:
+                self._status_cache.pop(order_id, None)
+
+    def _fetch_status(self, order_id):
+        status = self._client().check_status(order_id=order_id)
         if status['failed'] == True:
             return f"Failed - {status['info']}"
         elif status['finished'] == True:
@@ -52,14 +477,222 @@ class SDKClient:
             return f"{str(status['progress'])}% - {status['info']}"
         return str(status['progress'])
 
+    def check_status_many(self, order_ids, max_workers=8, callback=None, retries=2, backoff=0.5, cancel_event=None,
+                          max_age=None):
+        """
+        Check the status of many orders concurrently on a bounded thread pool.
+        Returns a list of (status, error) tuples in the same order as order_ids;
+        a failed check has status None and the exception as error instead of raising.
+        Transient errors are retried with exponential backoff.
+        If given, callback(order_id, status, error) is called as each result
+        arrives, on the calling thread (never on the pool's workers). Once
+        cancel_event (a threading.Event) is set, the orders not checked yet
+        fail with CheckCancelled.
+        max_age is passed on to checkStatus (0 forces fresh checks).
+        """
+        def check(order_id):
+            for attempt in range(retries + 1):
+                if cancel_event is not None and cancel_event.is_set():
+                    return None, CheckCancelled(order_id)
+                try:
+                    return self.checkStatus(order_id, max_age=max_age), None
+                except Exception as e:
+                    if attempt == retries or not is_transient_error(e):
+                        return None, e
+                    if cancel_event is not None:
+                        cancel_event.wait(backoff * (2 ** attempt))
+                    else:
+                        time.sleep(backoff * (2 ** attempt))
+
+        order_ids = list(order_ids)
+        results = [None] * len(order_ids)
+        if not order_ids:
+            return results
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(order_ids))) as pool:
+            futures = {pool.submit(check, order_id): index for index, order_id in enumerate(order_ids)}
+            for future in as_completed(futures):
+                index = futures[future]
+                results[index] = future.result()
+                if callback is not None:
+                    callback(order_ids[index], *results[index])
+        return results
+
+    def qc_check_many(self, order_ids, max_workers=8):
+        """
+        Check the QC of many orders concurrently on a bounded thread pool.
+        Returns a list of (outcome, error) tuples in the same order as order_ids:
+        outcome is as from qc_outcome() (None while QC is running), and a failed
+        check has outcome None and the exception as error instead of raising.
+        """
+        def check(order_id):
+            try:
+                return qc_outcome(self.qcCheck(order_id)), None
+            except Exception as e:
+                return None, e
+
+        order_ids = list(order_ids)
+        if not order_ids:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(order_ids))) as pool:
+            return list(pool.map(check, order_ids))
+
     def getResults(self, order_id, format):
-        results_raw = self.npcs.get_results(order_id=order_id, format=format)
+        """
+        Results of a finished job never change, so they are served from the
+        local results cache when possible and only fetched over the network once.
+        PNG results are returned as a BytesIO, other formats as str.
+        """
+        cached = self.results_cache.get(order_id, format)
+        if cached is not None:
+            if format == "PNG":
+                return io.BytesIO(cached)
+            return str(cached, "utf-8")
+
+        results_raw = self._client().get_results(order_id=order_id, format=format)
         if format == "PNG":
             png_bytes = results_raw
+            self.results_cache.put(order_id, format, png_bytes.getvalue())
             return png_bytes
         else:
+            self.results_cache.put(order_id, format, results_raw.encode("utf-8"))
             return results_raw
 
+    def results_path(self, order_id, format):
+        """
+        Path of the results file in the local results cache, fetched first on a
+        miss. Lets large (PNG) results be decoded or copied straight from disk.
+        """
+        path = self.results_cache.path(order_id, format)
+        if path is None or not os.path.exists(path):
+            self.getResults(order_id, format)
+            path = self.results_cache.path(order_id, format)
+            if path is None:
+                raise ValueError(f"Results of {order_id} could not be cached")
+        return path
+
+    def export_results(self, jobs, formats, destination, max_workers=8, skip_existing=True,
+                       progress_callback=None, cancel_event=None):
+        """
+        Export the results of many finished jobs, in each of formats, to the
+        directory destination, or into a zip archive if destination ends in .zip.
+        jobs are (order_id, dataset_id) pairs. Results are fetched concurrently on
+        a bounded thread pool through the results cache and copied from the cached
+        file, so at most one result per worker is ever held in memory.
+        Files already in the destination are skipped if skip_existing (a new
+        archive is built otherwise); an existing archive is only replaced once
+        the export is complete. A manifest.csv lists every file and its status;
+        the manifests of earlier exports to the same place are kept, so a later
+        one gets a _1, _2... suffix.
+        If given, progress_callback(done, total, bytes_written) is called from the
+        worker threads as each file is done. Once cancel_event (a threading.Event)
+        is set, the files not exported yet are recorded as cancelled.
+        Returns a summary dict: counts per status, bytes, seconds and the manifest's path.
+        """
+        start = time.monotonic()
+        to_zip = destination.lower().endswith(".zip")
+        items = [(order_id, dataset_id, format) for order_id, dataset_id in jobs for format in formats]
+        rows = [None] * len(items)
+        progress = {"done": 0, "bytes": 0}
+        progress_lock = threading.Lock()
+        zip_lock = threading.Lock()
+
+        if to_zip:
+            os.makedirs(os.path.dirname(os.path.abspath(destination)), exist_ok=True)
+            appending = skip_existing and os.path.exists(destination)
+            # The archive is built (or a copy of the existing one appended to) aside, and only
+            # replaces destination once complete: an interrupted export leaves it as it was
+            zip_path = destination + ".part"
+            if appending:
+                shutil.copyfile(destination, zip_path)
+            archive = zipfile.ZipFile(zip_path, "a" if appending else "w", allowZip64=True)
+            existing = set(archive.namelist())
+        else:
+            os.makedirs(destination, exist_ok=True)
+
+        def copy_result(order_id, format, file_name):
+            # The cached file may be evicted by another worker's fetch between the two calls: fetch it again
+            for attempt in range(2):
+                source = self.results_path(order_id, format)
+                try:
+                    if not to_zip:
+                        target = os.path.join(destination, file_name)
+                        shutil.copyfile(source, target + ".part")
+                        os.replace(target + ".part", target)
+                        return os.path.getsize(target)
+                    # zipfile has a single writer; it streams the file in chunks. PNGs are already compressed.
+                    compression = zipfile.ZIP_STORED if format == "PNG" else zipfile.ZIP_DEFLATED
+                    with zip_lock:
+                        archive.write(source, file_name, compress_type=compression)
+                        return archive.getinfo(file_name).file_size
+                except FileNotFoundError:
+                    if attempt == 1:
+                        raise
+
+        def export(index):
+            order_id, dataset_id, format = items[index]
+            file_name = result_file_name(dataset_id, order_id, format)
+            row = {"order_id": order_id, "dataset_id": dataset_id, "format": format, "file": file_name,
+                   "status": "exported", "bytes": 0, "error": ""}
+            written = 0
+            try:
+                if to_zip and file_name in existing:
+                    row["status"] = "skipped"
+                    row["bytes"] = archive.getinfo(file_name).file_size
+                elif not to_zip and skip_existing and os.path.exists(os.path.join(destination, file_name)):
+                    row["status"] = "skipped"
+                    row["bytes"] = os.path.getsize(os.path.join(destination, file_name))
+                elif cancel_event is not None and cancel_event.is_set():
+                    row["status"] = "cancelled"
+                else:
+                    written = row["bytes"] = copy_result(order_id, format, file_name)
+            except Exception as e:
+                row["status"] = "failed"
+                row["error"] = str(e)
+            rows[index] = row
+            with progress_lock:
+                progress["done"] += 1
+                progress["bytes"] += written
+                done, bytes_written = progress["done"], progress["bytes"]
+            if progress_callback is not None:
+                progress_callback(done, len(items), bytes_written)
+
+        try:
+            if items:
+                with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+                    list(pool.map(export, range(len(items))))
+            manifest = io.StringIO()
+            writer = csv.DictWriter(manifest, fieldnames=EXPORT_MANIFEST_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+            if to_zip:
+                manifest_name = unique_name(existing, EXPORT_MANIFEST)
+                archive.writestr(manifest_name, manifest.getvalue())
+                manifest_path = f"{destination}:{manifest_name}"
+            else:
+                names = set(os.listdir(destination))
+                while True:
+                    manifest_path = os.path.join(destination, unique_name(names, EXPORT_MANIFEST))
+                    try:
+                        # Exclusive: another export to the same folder may be writing its manifest too
+                        with open(manifest_path, "x", encoding="utf-8", newline="") as f:
+                            f.write(manifest.getvalue())
+                        break
+                    except FileExistsError:
+                        pass
+        finally:
+            if to_zip:
+                archive.close()
+        if to_zip:
+            os.replace(zip_path, destination)
+
+        summary = {status: 0 for status in ("exported", "skipped", "failed", "cancelled")}
+        for row in rows:
+            summary[row["status"]] += 1
+        summary["bytes"] = progress["bytes"]
+        summary["seconds"] = time.monotonic() - start
+        summary["manifest"] = manifest_path
+        return summary
+
     def getReport(self, start_date, end_date, format="email"):
-        response = self.npcs.get_report(start_date=start_date, end_date=end_date, format=format)
+        response = self._client().get_report(start_date=start_date, end_date=end_date, format=format)
         return response
@@ -0,0 +1,76 @@
+# startup_profile.py
+# Import-time and init-phase timing of application startup (main.py --profile-startup).
+import builtins
+import json
+import sys
+import threading
+import time
+
+_start = None
+_original_import = None
+_imports = {}  # module -> [self seconds, cumulative seconds]
+_phases = []   # (phase, seconds since start)
+_stack = []    # seconds spent in nested imports, one entry per import in progress
+
+def enabled():
+    return _start is not None
+
+def enable(start_time):
+    """
+    Start timing every module imported from now on, measured from start_time
+    (a time.perf_counter() value). Only imports on the main thread are timed:
+    those are the ones that delay the first paint.
+    """
+    global _start, _original_import
+    if _start is not None:
+        return
+    _start = start_time
+    _original_import = builtins.__import__
+    builtins.__import__ = _timed_import
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    if level or name in sys.modules or threading.current_thread() is not threading.main_thread():
+        return _original_import(name, globals, locals, fromlist, level)
+    start = time.perf_counter()
+    _stack.append(0.0)
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        elapsed = time.perf_counter() - start
+        nested = _stack.pop()
+        if _stack:
+            _stack[-1] += elapsed
+        entry = _imports.setdefault(name, [0.0, 0.0])
+        entry[0] += elapsed - nested
+        entry[1] += elapsed
+
+def mark(phase):
+    """Record that an init phase completed. Does nothing unless profiling is enabled."""
+    if _start is not None:
+        _phases.append((phase, time.perf_counter() - _start))
+
+def report():
+    """The timings so far: phases in order, imports by cumulative time."""
+    imports = sorted(_imports.items(), key=lambda item: item[1][1], reverse=True)
+    return {
+        "python": sys.version.split()[0],
+        "frozen": bool(getattr(sys, "frozen", False)),
+        "total_ms": round((time.perf_counter() - _start) * 1000, 1),
+        "phases": [{"phase": phase, "ms": round(seconds * 1000, 1)} for phase, seconds in _phases],
+        "imports": [
+            {"module": module, "self_ms": round(own * 1000, 1), "cumulative_ms": round(cumulative * 1000, 1)}
+            for module, (own, cumulative) in imports
+        ],
+    }
+
+def write_report(path, top=15):
+    """Write the report as JSON to path and print its summary."""
+    data = report()
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+    print(f"Startup profile ({data['total_ms']:.0f} ms) written to {path}")
+    for phase in data["phases"]:
+        print(f"  {phase['ms']:8.1f} ms  {phase['phase']}")
+    print("  Slowest imports (cumulative / self ms):")
+    for entry in data["imports"][:top]:
+        print(f"  {entry['cumulative_ms']:8.1f} / {entry['self_ms']:6.1f}  {entry['module']}")
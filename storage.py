@@ -1,13 +1,114 @@
 # storage.py
-# Handles persistent data storage using JSON.
+# Handles persistent data storage using SQLite.
+import atexit
 import json
 import os
 import platform
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
 
 APP_DATA_FILE = "app_data.json"
+APP_DB_FILE = "app_data.db"
+APP_JOURNAL_FILE = "app_data.journal"
+APP_LOCK_FILE = "app_data.lock"
 
-def get_app_data_file():
-    """Return the path to the writable app_data.json file based on the OS."""
+# Columns of the jobs table, in the order they are stored.
+JOB_FIELDS = ("order_id", "dataset_id", "last_status", "product", "qc", "timestamp")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    order_id TEXT PRIMARY KEY,
+    dataset_id TEXT,
+    last_status TEXT,
+    product TEXT,
+    qc TEXT,
+    timestamp TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_timestamp ON jobs(timestamp);
+CREATE INDEX IF NOT EXISTS idx_jobs_last_status ON jobs(last_status);
+CREATE INDEX IF NOT EXISTS idx_jobs_qc ON jobs(qc);
+CREATE TABLE IF NOT EXISTS jobs_archive (
+    order_id TEXT PRIMARY KEY,
+    dataset_id TEXT,
+    last_status TEXT,
+    product TEXT,
+    qc TEXT,
+    timestamp TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_archive_timestamp ON jobs_archive(timestamp);
+CREATE TABLE IF NOT EXISTS uploads (
+    order_id TEXT PRIMARY KEY,
+    dataset_path TEXT,
+    next_zip_index INTEGER DEFAULT 0,
+    created TEXT
+);
+CREATE TABLE IF NOT EXISTS upload_files (
+    order_id TEXT,
+    path TEXT,
+    size INTEGER,
+    sha256 TEXT,
+    zip_index INTEGER,
+    PRIMARY KEY (order_id, path)
+);
+CREATE TABLE IF NOT EXISTS scan_cache (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER,
+    size INTEGER,
+    sop_instance_uid TEXT,
+    series_instance_uid TEXT,
+    series_description TEXT,
+    modality TEXT
+);
+CREATE TABLE IF NOT EXISTS fingerprints (
+    fingerprint TEXT,
+    order_id TEXT,
+    dataset_path TEXT,
+    created TEXT,
+    PRIMARY KEY (fingerprint, order_id)
+);
+CREATE INDEX IF NOT EXISTS idx_fingerprints_order_id ON fingerprints(order_id);
+"""
+
+# Statuses after which a job never changes again. Jobs in one of these
+# states are moved from the (cached) jobs table to jobs_archive.
+TERMINAL_STATUSES = ("Finished", "QC failed")
+_TERMINAL_SQL = "(last_status IN ('Finished', 'QC failed') OR last_status LIKE 'Failed%')"
+
+# Seconds to wait after the last mutation before writing to disk.
+FLUSH_DELAY = 0.5
+
+# Journal size (bytes) past which it is folded back into the database.
+JOURNAL_COMPACT_BYTES = 256 * 1024
+
+_db = None
+_db_lock = threading.RLock()
+_batch_depth = 0
+
+# Process-wide write-through cache of the database contents.
+_cache = None            # {"api_key": str, "jobs": {order_id: job}}
+_cache_signature = None  # stat of the database and journal files when cached
+_pending_records = []    # journal records not yet appended to disk
+_flush_deadline = None  # time.monotonic() at which pending records are due on disk, or None
+_flush_wakeup = threading.Condition(_db_lock)  # wakes the flush thread
+_flush_thread = None
+_compaction_requested = False  # the flush thread compacts when it next wakes up
+_compacting = False
+_lock_file = None  # open app_data.lock, see _interprocess_lock
+_lock_depth = 0
+
+def get_app_data_dir():
+    """Return the writable app data directory based on the OS."""
     if platform.system() == "Darwin":  # macOS
         base_dir = os.path.expanduser("~/Library/Application Support/neuropacsUI")
     elif platform.system() == "Windows":  # Windows
@@ -16,86 +117,644 @@ def get_app_data_file():
         base_dir = os.path.expanduser("~/.neuropacsUI")
 
     os.makedirs(base_dir, exist_ok=True)
-    return os.path.join(base_dir, "app_data.json")
+    return base_dir
+
+def get_app_data_file():
+    """Return the path to the legacy app_data.json file."""
+    return os.path.join(get_app_data_dir(), APP_DATA_FILE)
+
+def get_app_db_file():
+    """Return the path to the SQLite database holding the app data."""
+    return os.path.join(get_app_data_dir(), APP_DB_FILE)
+
+def get_app_journal_file():
+    """Return the path to the append-only journal of app data mutations."""
+    return os.path.join(get_app_data_dir(), APP_JOURNAL_FILE)
+
+@contextmanager
+def _interprocess_lock():
+    """
+    Hold the app data lock file, which serializes journal appends, commits,
+    compactions and reloads with other processes using the same app data
+    (e.g. batch mode running next to the GUI). Reentrant within the process.
+    """
+    global _lock_file, _lock_depth
+    with _db_lock:
+        if _lock_depth == 0:
+            if _lock_file is None:
+                _lock_file = open(os.path.join(get_app_data_dir(), APP_LOCK_FILE), "a+b")
+            if fcntl is not None:
+                fcntl.flock(_lock_file.fileno(), fcntl.LOCK_EX)
+            else:
+                _lock_file.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(_lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        pass  # LK_LOCK gives up after 10 s
+        _lock_depth += 1
+        try:
+            yield
+        finally:
+            _lock_depth -= 1
+            if _lock_depth == 0:
+                if fcntl is not None:
+                    fcntl.flock(_lock_file.fileno(), fcntl.LOCK_UN)
+                else:
+                    _lock_file.seek(0)
+                    msvcrt.locking(_lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+def _get_db():
+    """
+    Open (once per process) the app database, creating the schema and
+    importing any legacy app_data.json on first launch.
+    """
+    global _db
+    with _db_lock:
+        if _db is None:
+            db = sqlite3.connect(get_app_db_file(), check_same_thread=False, isolation_level=None)
+            db.row_factory = sqlite3.Row
+            db.executescript(_SCHEMA)
+            _migrate_json(db)
+            _db = db
+        return _db
+
+def _migrate_json(db):
+    """
+    One-time import of app_data.json into the database.
+    The JSON file is kept next to the database as app_data.json.migrated.
+    """
+    json_path = get_app_data_file()
+    if not os.path.exists(json_path):
+        return
+    try:
+        with open(json_path, "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Could not migrate {json_path}: {e}")
+        return
+
+    rows = []
+    for job in data.get("jobs", []):
+        if "order_id" not in job:
+            continue
+        rows.append((
+            job["order_id"],
+            job.get("dataset_id", "Unknown"),
+            job.get("last_status", "Started"),
+            job.get("product", ""),
+            job.get("qc", "NA"),
+            job.get("timestamp", ""),
+        ))
+
+    db.execute("BEGIN")
+    try:
+        if data.get("api_key"):
+            db.execute("INSERT OR IGNORE INTO settings (key, value) VALUES ('api_key', ?)", (data["api_key"],))
+        db.executemany("INSERT OR IGNORE INTO jobs VALUES (?, ?, ?, ?, ?, ?)", rows)
+        db.execute("COMMIT")
+    except Exception:
+        db.execute("ROLLBACK")
+        raise
+    os.replace(json_path, json_path + ".migrated")
+    print(f"Migrated {len(rows)} jobs from {json_path}")
+
+@contextmanager
+def batch():
+    """
+    Group several storage writes into a single transaction.
+    Nested batches join the outermost one, which commits on exit
+    (or rolls everything back if an exception escapes).
+    """
+    global _batch_depth
+    db = _get_db()
+    with _db_lock, _interprocess_lock():
+        if _batch_depth == 0:
+            signature = _signature()
+            db.execute("BEGIN")
+        _batch_depth += 1
+        try:
+            yield db
+        except Exception:
+            _batch_depth -= 1
+            if _batch_depth == 0:
+                db.execute("ROLLBACK")
+            raise
+        _batch_depth -= 1
+        if _batch_depth == 0:
+            db.execute("COMMIT")
+            _note_local_write(signature)
+
+def _row_to_job(row):
+    return {field: row[field] for field in JOB_FIELDS}
+
+def is_terminal_status(status):
+    """Return True if a job with this status will never change again."""
+    return status in TERMINAL_STATUSES or str(status).startswith("Failed")
+
+def _file_signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def _signature():
+    return (_file_signature(get_app_db_file()), _file_signature(get_app_journal_file()))
+
+def _note_local_write(signature_before):
+    """
+    This process just wrote to the database or journal: if the cache was up
+    to date before, it still is, so it is not reloaded for our own write.
+    """
+    global _cache_signature
+    if _cache_signature is not None and _cache_signature == signature_before:
+        _cache_signature = _signature()
+
+def _apply(data, record):
+    """Apply one journal record to the in-memory app data."""
+    op = record["op"]
+    jobs = data["jobs"]
+    if op == "add":
+        jobs.setdefault(record["order_id"], dict(record["job"]))
+    elif op == "update":
+        job = jobs.get(record["order_id"])
+        if job is not None:
+            job[record["field"]] = record["value"]
+    elif op == "remove":
+        jobs.pop(record["order_id"], None)
+    elif op == "set":
+        data[record["key"]] = record["value"]
+
+def _read_journal():
+    """
+    Yield the records stored in the journal. A torn line (the app died
+    mid-append; flush ends it before appending more) is skipped.
+    """
+    try:
+        f = open(get_app_journal_file(), "r")
+    except FileNotFoundError:
+        return
+    with f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+def _read_snapshot():
+    """
+    Read the app data from disk: the database snapshot plus the journal.
+    Returns (data, order_ids and settings keys the journal touches).
+    Call with the interprocess lock held, so no compaction runs in between.
+    """
+    db = _get_db()
+    row = db.execute("SELECT value FROM settings WHERE key = 'api_key'").fetchone()
+    rows = db.execute(f"SELECT {', '.join(JOB_FIELDS)} FROM jobs ORDER BY rowid").fetchall()
+    data = {
+        "api_key": row["value"] if row else "",
+        "jobs": {job["order_id"]: job for job in map(_row_to_job, rows)},
+    }
+    touched_jobs = {}  # ordered set
+    touched_settings = set()
+    for record in _read_journal():
+        _apply(data, record)
+        if record["op"] == "set":
+            touched_settings.add(record["key"])
+        else:
+            touched_jobs[record["order_id"]] = None
+    return data, touched_jobs, touched_settings
+
+def _load_cache():
+    """
+    Return the cached app data, rebuilding it from the database snapshot
+    plus the journal if it was never loaded or if either file changed on
+    disk since (e.g. another process wrote). Unflushed local writes are
+    applied again over a reload, so they always win.
+    """
+    global _cache, _cache_signature
+    with _db_lock:
+        if _cache is not None and _signature() == _cache_signature:
+            return _cache
+        with _interprocess_lock():
+            data, _, _ = _read_snapshot()
+            signature = _signature()
+        for record in _pending_records:
+            _apply(data, record)
+        _cache = data
+        _cache_signature = signature
+        if any(is_terminal_status(job["last_status"]) for job in data["jobs"].values()):
+            # Archive jobs that finished since the last compaction. Until it is done a job can be
+            # both in the cache and in the archive; the jobs model skips rows it already has.
+            _request_compaction()
+        return _cache
+
+def _record(record):
+    """Apply a mutation to the cache and queue it for the journal."""
+    _apply(_load_cache(), record)
+    _pending_records.append(record)
+    _schedule_flush()
+
+def _schedule_flush():
+    """
+    Debounce writes: push the flush deadline back. This only sets a number;
+    the flush thread is woken when it had nothing due, and otherwise finds
+    the later deadline once it wakes up for the earlier one.
+    """
+    global _flush_deadline
+    with _flush_wakeup:
+        idle = _flush_deadline is None
+        _flush_deadline = time.monotonic() + FLUSH_DELAY
+        if idle:
+            _wake_flush_thread()
+
+def _request_compaction():
+    """Have the flush thread compact, off the calling (often UI) thread."""
+    global _compaction_requested
+    with _flush_wakeup:
+        if not _compacting and not _compaction_requested:
+            _compaction_requested = True
+            _wake_flush_thread()
+
+def _wake_flush_thread():
+    global _flush_thread
+    if _flush_thread is None:
+        _flush_thread = threading.Thread(target=_flush_loop, name="storage-flush", daemon=True)
+        _flush_thread.start()
+    else:
+        _flush_wakeup.notify()
+
+def _flush_loop():
+    """
+    The one long-lived flush thread: writes pending records once their
+    deadline passes, and compacts when asked to.
+    """
+    global _compaction_requested
+    with _flush_wakeup:
+        while True:
+            if _compaction_requested:
+                _compaction_requested = False
+                try:
+                    compact()
+                except Exception as e:
+                    print(f"Could not compact app data: {e}")
+            elif _flush_deadline is None:
+                _flush_wakeup.wait()
+            elif time.monotonic() < _flush_deadline:
+                _flush_wakeup.wait(_flush_deadline - time.monotonic())
+            else:
+                try:
+                    flush()
+                except Exception as e:
+                    print(f"Could not write app data: {e}")
+
+def flush():
+    """
+    Append all pending mutations to the journal in a single write.
+    Called automatically shortly after the last mutation and on exit.
+    Once the journal grows past JOURNAL_COMPACT_BYTES a background
+    compaction folds it into the database.
+    """
+    global _flush_deadline
+    with _db_lock:
+        _flush_deadline = None
+        if not _pending_records:
+            return
+        journal_path = get_app_journal_file()
+        payload = "".join(json.dumps(record) + "\n" for record in _pending_records)
+        with _interprocess_lock():
+            # Taken under the lock: if another process appended since the cache was read, the
+            # signature no longer matches it and the cache is reloaded instead of advanced
+            signature = _signature()
+            with open(journal_path, "ab+") as f:
+                end = f.seek(0, os.SEEK_END)
+                if end:
+                    f.seek(end - 1)
+                    # The app died mid-append: end the torn line so the first new record is not glued onto it
+                    if f.read(1) != b"\n":
+                        payload = "\n" + payload
+                f.write(payload.encode("utf-8"))
+            _note_local_write(signature)
+        _pending_records.clear()
+        if os.path.getsize(journal_path) > JOURNAL_COMPACT_BYTES:
+            _request_compaction()
+
+def compact():
+    """
+    Fold the journal into the database snapshot and truncate it, then move
+    jobs in a terminal state to jobs_archive and drop them from the cache.
+    Journal records are idempotent, so a crash between the commit and the
+    truncation only means they get replayed over a snapshot that already
+    contains them. The whole compaction holds the interprocess lock, and
+    reads the journal again under it, so records other processes appended
+    are folded in too and none can be appended before the truncation.
+    """
+    global _cache, _cache_signature, _compacting
+    with _db_lock, _interprocess_lock():
+        _compacting = True
+        try:
+            flush()
+            data, touched_jobs, touched_settings = _read_snapshot()
+            terminal = [order_id for order_id, job in data["jobs"].items() if is_terminal_status(job["last_status"])]
+            if not touched_jobs and not touched_settings and not terminal:
+                _cache, _cache_signature = data, _signature()
+                return
+            with batch() as db:
+                for key in touched_settings:
+                    db.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (key, data.get(key, "")))
+                for order_id in touched_jobs:
+                    job = data["jobs"].get(order_id)
+                    if job is None:
+                        db.execute("DELETE FROM jobs WHERE order_id = ?", (order_id,))
+                        continue
+                    values = tuple(job[field] for field in JOB_FIELDS)
+                    cur = db.execute(
+                        f"UPDATE jobs SET {', '.join(f'{field} = ?' for field in JOB_FIELDS)} WHERE order_id = ?",
+                        values + (order_id,),
+                    )
+                    if cur.rowcount == 0:
+                        db.execute("INSERT INTO jobs VALUES (?, ?, ?, ?, ?, ?)", values)
+                db.execute(f"INSERT OR REPLACE INTO jobs_archive SELECT {', '.join(JOB_FIELDS)} FROM jobs WHERE {_TERMINAL_SQL} ORDER BY rowid")
+                db.execute(f"DELETE FROM jobs WHERE {_TERMINAL_SQL}")
+            open(get_app_journal_file(), "w").close()
+            for order_id in terminal:
+                del data["jobs"][order_id]
+            _cache = data
+            _cache_signature = _signature()
+        finally:
+            _compacting = False
+
+atexit.register(flush)
+
+def _archived_job(order_id):
+    with _db_lock:
+        row = _get_db().execute(f"SELECT {', '.join(JOB_FIELDS)} FROM jobs_archive WHERE order_id = ?", (order_id,)).fetchone()
+    return _row_to_job(row) if row else None
 
 def load_app_data():
-    app_data_path = get_app_data_file()
-    if os.path.exists(app_data_path):
-        with open(app_data_path, "r") as f:
-            return json.load(f)
-    return {"api_key": "", "jobs": []}
+    """Return all app data as a dict, in the shape of the legacy JSON file."""
+    return {"api_key": get_api_key(), "jobs": get_jobs(include_archived=True)}
 
 def save_app_data(data):
-    app_data_path = get_app_data_file()
-    with open(app_data_path, "w") as f:
-        json.dump(data, f, indent=2)
+    """Replace all app data with the contents of a legacy-shaped dict."""
+    with _db_lock:
+        for order_id in list(_load_cache()["jobs"]):
+            _record({"op": "remove", "order_id": order_id})
+        with batch() as db:
+            db.execute("DELETE FROM jobs_archive")
+        for job in data.get("jobs", []):
+            _record({"op": "add", "order_id": job["order_id"], "job": {field: job.get(field) for field in JOB_FIELDS}})
+        set_api_key(data.get("api_key", ""))
 
 def get_api_key():
-    data = load_app_data()
-    return data.get("api_key", "")
+    with _db_lock:
+        return _load_cache()["api_key"]
 
 def set_api_key(api_key):
-    data = load_app_data()
-    data["api_key"] = api_key
-    save_app_data(data)
+    with _db_lock:
+        _record({"op": "set", "key": "api_key", "value": api_key})
 
 def add_job(order_id, dataset_id, product, qc, timestamp):
     """
-    Adds a job entry with order_id and dataset_id to the jobs list.
-    If the order_id already exists, we update the dataset_id.
+    Adds a job entry with order_id and dataset_id to the jobs table.
+    If the order_id already exists, the existing job is left untouched.
     """
-    data = load_app_data()
-    if "jobs" not in data:
-        data["jobs"] = []
-
-    # Check if there's already a job with this order_id
-    for job in data["jobs"]:
-        if job["order_id"] == order_id:
+    with _db_lock:
+        if get_job(order_id) is not None:
             print(f"A job with order ID {order_id} already exists!")
-            # job["dataset_id"] = dataset_id
-            # job["last_status"] = "Started",
-            # save_app_data(data)
             return
+        job = {"order_id": order_id, "dataset_id": dataset_id, "last_status": "Started", "product": product, "qc": qc, "timestamp": timestamp}
+        _record({"op": "add", "order_id": order_id, "job": job})
+
+def get_jobs(include_archived=False):
+    """
+    Returns the list of active job dictionaries, in the order they were added.
+    Archived (terminal) jobs are only included if include_archived is True;
+    use get_archived_jobs to page through them instead.
+    The dictionaries are copies; use update_job_field to change a job.
+    """
+    with _db_lock:
+        jobs = [dict(job) for job in _load_cache()["jobs"].values()]
+    if include_archived:
+        jobs.extend(get_archived_jobs())
+    return jobs
+
+def get_archived_jobs(offset=0, limit=None):
+    """
+    Returns archived job dictionaries, most recent first.
+    """
+    with _db_lock:
+        rows = _get_db().execute(
+            f"SELECT {', '.join(JOB_FIELDS)} FROM jobs_archive ORDER BY timestamp DESC LIMIT ? OFFSET ?",
+            (-1 if limit is None else limit, offset),
+        ).fetchall()
+    return [_row_to_job(row) for row in rows]
+
+def count_archived_jobs():
+    with _db_lock:
+        return _get_db().execute("SELECT COUNT(*) FROM jobs_archive").fetchone()[0]
 
-    # Otherwise, append a new job dictionary
-    data["jobs"].append({"order_id": order_id, "dataset_id": dataset_id, "last_status": "Started", "product": product, "qc": qc, "timestamp": timestamp})
-    save_app_data(data)
+def search_archived_jobs(terms, fields, limit=500):
+    """
+    Returns archived jobs, most recent first, in which every term (lowercase
+    alphanumerics) occurs in one of fields. Substring matches are a superset
+    of the token prefix matches of the jobs search, which filters them further.
+    """
+    if not terms:
+        return []
+    unknown = set(fields) - set(JOB_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown job fields: {sorted(unknown)}")
+    condition = " AND ".join(
+        "(" + " OR ".join(f"lower({field}) LIKE ?" for field in fields) + ")" for _ in terms
+    )
+    params = [f"%{term}%" for term in terms for _ in fields]
+    with _db_lock:
+        rows = _get_db().execute(
+            f"SELECT {', '.join(JOB_FIELDS)} FROM jobs_archive WHERE {condition} ORDER BY timestamp DESC LIMIT ?",
+            params + [limit],
+        ).fetchall()
+    return [_row_to_job(row) for row in rows]
 
-def get_jobs():
+def get_job(order_id):
     """
-    Returns the full list of job dictionaries.
+    Returns a copy of the job with the given order_id, active or archived,
+    or None if it is not stored.
     """
-    data = load_app_data()
-    return data.get("jobs", [])
+    with _db_lock:
+        job = _load_cache()["jobs"].get(order_id)
+        if job is not None:
+            return dict(job)
+    return _archived_job(order_id)
 
 def remove_job(order_id):
     """
-    Remove a job dictionary (by matching order_id) from the stored jobs in app_data.json.
+    Remove a job (by matching order_id) from the stored jobs.
     """
-    data = load_app_data()
-    jobs = data.get("jobs", [])
-    for job in jobs:
-        if job["order_id"] == order_id:
-            jobs.remove(job)
-            break
-    data["jobs"] = jobs
-    save_app_data(data)
+    remove_jobs([order_id])
 
 def update_job_field(order_id, field, value):
     """
     Updates a specific field of a job with the given order_id.
     If the job or field does not exist, it raises a ValueError.
     """
-    data = load_app_data()
-    jobs = data.get("jobs", [])
+    update_jobs({order_id: {field: value}})
 
-    for job in jobs:
-        if job["order_id"] == order_id:
-            if field in job:
-                job[field] = value
-                save_app_data(data)
-                return
+def update_jobs(changes):
+    """
+    Apply many field updates at once, as {order_id: {field: value}}.
+    Everything is validated before anything is written, so an unknown
+    job or field raises a ValueError and leaves all jobs unchanged.
+    """
+    with _db_lock:
+        jobs = _load_cache()["jobs"]
+        archived = []
+        for order_id, fields in changes.items():
+            for field in fields:
+                if field not in JOB_FIELDS:
+                    raise ValueError(f"Field '{field}' does not exist in the job.")
+            if order_id not in jobs:
+                if _archived_job(order_id) is None:
+                    raise ValueError(f"Job with order_id '{order_id}' not found.")
+                archived.append(order_id)
+        for order_id, fields in changes.items():
+            if order_id in archived:
+                continue
+            for field, value in fields.items():
+                _record({"op": "update", "order_id": order_id, "field": field, "value": value})
+        if archived:
+            # Archived jobs are rarely touched; write them straight through
+            with batch() as db:
+                for order_id in archived:
+                    for field, value in changes[order_id].items():
+                        db.execute(f"UPDATE jobs_archive SET {field} = ? WHERE order_id = ?", (value, order_id))
+
+def remove_jobs(order_ids):
+    """
+    Remove many jobs (by order_id) at once, active or archived.
+    Unknown order_ids are ignored.
+    """
+    with _db_lock:
+        jobs = _load_cache()["jobs"]
+        archived = []
+        for order_id in order_ids:
+            if order_id in jobs:
+                _record({"op": "remove", "order_id": order_id})
             else:
-                raise ValueError(f"Field '{field}' does not exist in the job.")
-    
-    raise ValueError(f"Job with order_id '{order_id}' not found.")
+                archived.append(order_id)
+        if archived:
+            with batch() as db:
+                db.executemany("DELETE FROM jobs_archive WHERE order_id = ?", [(order_id,) for order_id in archived])
+
+def create_upload(order_id, dataset_path, files, created=""):
+    """
+    Record the manifest of an upload that is about to start, so it can be
+    resumed later. files is a list of (path, size, sha256) tuples.
+    """
+    with batch() as db:
+        db.execute("INSERT OR REPLACE INTO uploads VALUES (?, ?, 0, ?)", (order_id, dataset_path, created))
+        db.execute("DELETE FROM upload_files WHERE order_id = ?", (order_id,))
+        db.executemany(
+            "INSERT INTO upload_files VALUES (?, ?, ?, ?, NULL)",
+            [(order_id, path, size, sha256) for path, size, sha256 in files],
+        )
+
+def get_upload(order_id):
+    """
+    Returns the recorded manifest of an unfinished upload, or None. Files with
+    a zip_index were accepted by the backend as part of that zip archive.
+    """
+    with _db_lock:
+        db = _get_db()
+        row = db.execute("SELECT * FROM uploads WHERE order_id = ?", (order_id,)).fetchone()
+        if row is None:
+            return None
+        files = db.execute(
+            "SELECT path, size, sha256, zip_index FROM upload_files WHERE order_id = ? ORDER BY rowid", (order_id,)
+        ).fetchall()
+    upload = dict(row)
+    upload["files"] = [dict(file) for file in files]
+    return upload
+
+def mark_part_uploaded(order_id, zip_index, paths):
+    """Record that the zip archive zip_index, holding paths, was accepted."""
+    with batch() as db:
+        db.executemany(
+            "UPDATE upload_files SET zip_index = ? WHERE order_id = ? AND path = ?",
+            [(zip_index, order_id, path) for path in paths],
+        )
+        db.execute("UPDATE uploads SET next_zip_index = ? WHERE order_id = ?", (zip_index + 1, order_id))
+
+def get_resumable_uploads():
+    """
+    Returns a summary of every unfinished upload: order_id, dataset_path,
+    files_total, files_done, bytes_total and bytes_done.
+    """
+    with _db_lock:
+        rows = _get_db().execute("""
+            SELECT u.order_id, u.dataset_path,
+                   COUNT(f.path) AS files_total,
+                   COUNT(f.zip_index) AS files_done,
+                   COALESCE(SUM(f.size), 0) AS bytes_total,
+                   COALESCE(SUM(CASE WHEN f.zip_index IS NOT NULL THEN f.size END), 0) AS bytes_done
+            FROM uploads u LEFT JOIN upload_files f ON f.order_id = u.order_id
+            GROUP BY u.order_id ORDER BY u.rowid
+        """).fetchall()
+    return [dict(row) for row in rows]
+
+def remove_upload(order_id):
+    """Forget an upload, once it finished or was abandoned."""
+    with batch() as db:
+        db.execute("DELETE FROM upload_files WHERE order_id = ?", (order_id,))
+        db.execute("DELETE FROM uploads WHERE order_id = ?", (order_id,))
+
+# Column order of scan_cache rows
+SCAN_CACHE_FIELDS = ("path", "mtime_ns", "size", "sop_instance_uid", "series_instance_uid", "series_description", "modality")
+
+def get_scan_cache(paths):
+    """
+    Returns {path: row} of cached DICOM header scans for the given paths.
+    A row with sop_instance_uid None marks a file that is not a DICOM instance.
+    """
+    paths = list(paths)
+    cached = {}
+    with _db_lock:
+        db = _get_db()
+        # Stay below SQLite's limit on query parameters
+        for start in range(0, len(paths), 500):
+            chunk = paths[start:start + 500]
+            rows = db.execute(
+                f"SELECT * FROM scan_cache WHERE path IN ({', '.join('?' * len(chunk))})", chunk
+            ).fetchall()
+            cached.update((row["path"], dict(row)) for row in rows)
+    return cached
+
+def put_scan_cache(rows):
+    """Store header scans, as dicts with the SCAN_CACHE_FIELDS keys."""
+    with batch() as db:
+        db.executemany(
+            f"INSERT OR REPLACE INTO scan_cache VALUES ({', '.join('?' * len(SCAN_CACHE_FIELDS))})",
+            [tuple(row[field] for field in SCAN_CACHE_FIELDS) for row in rows],
+        )
+
+def add_fingerprint(fingerprint, order_id, dataset_path, created=""):
+    """Record that the dataset with this fingerprint was uploaded as order_id."""
+    with batch() as db:
+        db.execute("INSERT OR REPLACE INTO fingerprints VALUES (?, ?, ?, ?)", (fingerprint, order_id, dataset_path, created))
+
+def _failed_qc(order_id):
+    job = get_job(order_id)
+    return job is not None and (job["qc"] == "FAIL" or job["last_status"] == "QC failed")
+
+def find_fingerprint(fingerprint):
+    """
+    Returns the earlier uploads (order_id, dataset_path, created) of a dataset,
+    oldest first. Uploads are fingerprinted before QC; those that then failed
+    QC are left out, as they are no use for a rerun.
+    """
+    with _db_lock:
+        rows = _get_db().execute(
+            "SELECT order_id, dataset_path, created FROM fingerprints WHERE fingerprint = ? ORDER BY rowid", (fingerprint,)
+        ).fetchall()
+    return [dict(row) for row in rows if not _failed_qc(row["order_id"])]
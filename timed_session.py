@@ -0,0 +1,39 @@
+# timed_session.py
+# Pooled HTTP session that records per-endpoint request latency.
+import threading
+import time
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+
+# (connect, read) seconds for requests made without a timeout, so a stalled
+# connection cannot hold a worker thread (and the app's exit) forever
+DEFAULT_TIMEOUT = (10, 120)
+
+class TimedSession(requests.Session):
+    """
+    A pooled keep-alive requests session that records per-endpoint latency.
+    """
+    def __init__(self, pool_maxsize=16):
+        super().__init__()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+        self.latency = {}  # endpoint -> [count, total seconds, max seconds]
+        self._latency_lock = threading.Lock()
+
+    def request(self, method, url, *args, **kwargs):
+        kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+        start = time.perf_counter()
+        try:
+            return super().request(method, url, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            parts = urlsplit(url)
+            # API calls are grouped by path, presigned upload URLs by host
+            endpoint = f"{method} {parts.path}" if "/api/" in parts.path else f"{method} {parts.netloc}"
+            with self._latency_lock:
+                stats = self.latency.setdefault(endpoint, [0, 0.0, 0.0])
+                stats[0] += 1
+                stats[1] += elapsed
+                stats[2] = max(stats[2], elapsed)
@@ -0,0 +1,96 @@
+# export_dialog.py
+# Bulk export of the results of many finished jobs to a directory or zip archive.
+import os
+from PyQt5.QtWidgets import (
+    QDialog, QFormLayout, QHBoxLayout, QLineEdit, QPushButton, QCheckBox, QSpinBox,
+    QDialogButtonBox, QFileDialog, QMessageBox, QLabel
+)
+from PyQt5.QtCore import QObject, pyqtSignal
+from sdk_client import RESULT_EXTENSIONS
+
+# Concurrent downloads of a bulk export
+EXPORT_WORKERS = 8
+
+class ExportProgress(QObject):
+    """Relays export_results' progress callback, called on worker threads, to the UI thread."""
+    progress = pyqtSignal(int, int, object)  # done, total, bytes written
+
+    def __call__(self, done, total, bytes_written):
+        self.progress.emit(done, total, bytes_written)
+
+class ExportResultsDialog(QDialog):
+    """Asks for the formats and destination (directory or .zip) of a bulk results export."""
+    def __init__(self, job_count, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Export Results")
+        layout = QFormLayout(self)
+        layout.addRow(QLabel(f"Export the results of {job_count} finished job(s)."))
+
+        formats_layout = QHBoxLayout()
+        self.format_checkboxes = {}
+        for format in RESULT_EXTENSIONS:
+            checkbox = QCheckBox(format)
+            checkbox.setChecked(format == "PNG")
+            self.format_checkboxes[format] = checkbox
+            formats_layout.addWidget(checkbox)
+        layout.addRow("Formats:", formats_layout)
+
+        destination_layout = QHBoxLayout()
+        self.destination_edit = QLineEdit()
+        self.destination_edit.setPlaceholderText("Folder, or a .zip file")
+        folder_button = QPushButton("Folder...")
+        folder_button.clicked.connect(self.choose_folder)
+        zip_button = QPushButton("Zip...")
+        zip_button.clicked.connect(self.choose_zip)
+        destination_layout.addWidget(self.destination_edit)
+        destination_layout.addWidget(folder_button)
+        destination_layout.addWidget(zip_button)
+        layout.addRow("Destination:", destination_layout)
+
+        self.skip_existing_checkbox = QCheckBox("Skip files already exported")
+        self.skip_existing_checkbox.setChecked(True)
+        layout.addRow(self.skip_existing_checkbox)
+
+        self.workers_spinbox = QSpinBox()
+        self.workers_spinbox.setRange(1, 32)
+        self.workers_spinbox.setValue(EXPORT_WORKERS)
+        layout.addRow("Parallel downloads:", self.workers_spinbox)
+
+        button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        button_box.accepted.connect(self.accept)
+        button_box.rejected.connect(self.reject)
+        layout.addRow(button_box)
+
+    def choose_folder(self):
+        path = QFileDialog.getExistingDirectory(self, "Export Results To")
+        if path:
+            self.destination_edit.setText(path)
+
+    def choose_zip(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Results To", "results.zip", "Zip Archive (*.zip)",
+            options=QFileDialog.DontConfirmOverwrite
+        )
+        if path:
+            if not path.lower().endswith(".zip"):
+                path += ".zip"
+            self.destination_edit.setText(path)
+
+    def get_options(self):
+        """Return (formats, destination, skip_existing, workers)."""
+        formats = [format for format, checkbox in self.format_checkboxes.items() if checkbox.isChecked()]
+        return (formats, self.destination_edit.text().strip(),
+                self.skip_existing_checkbox.isChecked(), self.workers_spinbox.value())
+
+    def accept(self):
+        formats, destination, _, _ = self.get_options()
+        if not formats:
+            QMessageBox.warning(self, "Export Results", "Select at least one format.")
+            return
+        if not destination:
+            QMessageBox.warning(self, "Export Results", "Choose a folder or zip file to export to.")
+            return
+        if not destination.lower().endswith(".zip") and os.path.isfile(destination):
+            QMessageBox.warning(self, "Export Results", f"'{destination}' is a file, not a folder.")
+            return
+        super().accept()
@@ -0,0 +1,555 @@
+# jobs_model.py
+# Model/view pieces of the jobs table: the job store as a table model, sorting/search, and painted row actions.
+import re
+from bisect import bisect_left
+from storage import get_archived_jobs
+from PyQt5.QtWidgets import QStyledItemDelegate
+from PyQt5.QtGui import QIcon, QColor
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QRect, QEvent, pyqtSignal
+
+# Number of archived (finished/failed) jobs loaded each time the user scrolls to the end of the table
+ARCHIVE_PAGE_SIZE = 200
+
+# Raw value of a cell, used for sorting
+SORT_ROLE = Qt.UserRole
+# The job dict of a row
+JOB_ROLE = Qt.UserRole + 1
+
+TEXT_COLOR = QColor("#333333")
+STALE_COLOR = QColor("#999999")
+
+# QC value -> icon file, for the QC column
+QC_ICONS = {"PASS": "resources/pass.png", "FAIL": "resources/fail.png", "IP": "resources/loading.png"}
+UNKNOWN_QC_ICON = "resources/question.png"
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+def tokenize(text):
+    """Lowercase alphanumeric runs of text: "Failed - Bad series" -> ["failed", "bad", "series"]."""
+    return _TOKEN_RE.findall(str(text).lower()) if text else []
+
+class JobSearchIndex:
+    """
+    Prefix index over the searchable fields of the loaded jobs.
+    Each field keeps a token -> order_ids posting map plus its tokens in sorted
+    order, so all tokens starting with a query term form one contiguous,
+    bisectable range. A query matches the jobs having, for every query term,
+    some token (in the searched field, or any field) that starts with it.
+    Adding, removing or re-indexing one job only touches that job's tokens.
+    """
+    FIELDS = ("order_id", "dataset_id", "product", "qc", "last_status")
+
+    def __init__(self):
+        self._postings = {field: {} for field in self.FIELDS}  # field -> token -> set of order_ids
+        self._tokens = {field: [] for field in self.FIELDS}    # field -> sorted tokens
+        self._job_tokens = {}  # order_id -> tokens of each field
+
+    def __len__(self):
+        return len(self._job_tokens)
+
+    def clear(self):
+        self.__init__()
+
+    def add(self, job):
+        new_tokens = {}
+        self._add(job, new_tokens)
+        for field, tokens in new_tokens.items():
+            sorted_tokens = self._tokens[field]
+            for token in tokens:
+                sorted_tokens.insert(bisect_left(sorted_tokens, token), token)
+
+    def add_many(self, jobs):
+        """Index many jobs at once, merging their new tokens into the sorted lists in one sort."""
+        new_tokens = {}
+        for job in jobs:
+            self._add(job, new_tokens)
+        for field, tokens in new_tokens.items():
+            self._tokens[field].extend(tokens)
+            self._tokens[field].sort()
+
+    def _add(self, job, new_tokens):
+        """Add the postings of job; tokens new to a field are collected in new_tokens[field]."""
+        order_id = job["order_id"]
+        if order_id in self._job_tokens:
+            self.remove(order_id)
+        # Tuples of strings are not tracked by the garbage collector, unlike sets
+        job_tokens = self._job_tokens[order_id] = tuple(tuple(set(tokenize(job.get(field)))) for field in self.FIELDS)
+        for field, tokens in zip(self.FIELDS, job_tokens):
+            postings = self._postings[field]
+            for token in tokens:
+                ids = postings.get(token)
+                if ids is None:
+                    ids = postings[token] = set()
+                    new_tokens.setdefault(field, []).append(token)
+                ids.add(order_id)
+
+    def remove(self, order_id):
+        job_tokens = self._job_tokens.pop(order_id, None)
+        if job_tokens is None:
+            return
+        for field, tokens in zip(self.FIELDS, job_tokens):
+            postings = self._postings[field]
+            for token in tokens:
+                ids = postings[token]
+                ids.discard(order_id)
+                if not ids:
+                    del postings[token]
+                    sorted_tokens = self._tokens[field]
+                    del sorted_tokens[bisect_left(sorted_tokens, token)]
+
+    def update(self, job, fields):
+        """Re-index job if any of the changed fields is searchable."""
+        if any(field in self._postings for field in fields):
+            self.add(job)
+
+    def _prefix_ids(self, term, fields):
+        """order_ids having a token starting with term in one of fields (a new set)."""
+        matches = []
+        for field in fields:
+            sorted_tokens = self._tokens[field]
+            postings = self._postings[field]
+            start = bisect_left(sorted_tokens, term)
+            # Every token with the prefix sorts before term + the last code point
+            end = bisect_left(sorted_tokens, term + "\uffff", start)
+            matches.extend(postings[token] for token in sorted_tokens[start:end])
+        if not matches:
+            return set()
+        # Short prefixes hit common tokens ("p" -> "patient", "psp"): start from
+        # the largest posting and stop as soon as every job is matched
+        matches.sort(key=len, reverse=True)
+        result = set(matches[0])
+        total = len(self._job_tokens)
+        for ids in matches[1:]:
+            if len(result) == total:
+                break
+            result |= ids
+        return result
+
+    def search(self, terms, field=None):
+        """The set of order_ids matching every term, in field or in any field."""
+        fields = self.FIELDS if field is None else (field,)
+        result = None
+        # Longest terms first: they tend to have the fewest matches
+        for term in sorted(terms, key=len, reverse=True):
+            ids = self._prefix_ids(term, fields)
+            result = ids if result is None else result & ids
+            if not result:
+                break
+        return result if result is not None else set()
+
+    @classmethod
+    def matches(cls, job, terms, field=None):
+        """Whether a single job matches terms, without the index."""
+        tokens = [token for f in (cls.FIELDS if field is None else (field,)) for token in tokenize(job.get(f))]
+        return all(any(token.startswith(term) for token in tokens) for term in terms)
+
+class JobsTableModel(QAbstractTableModel):
+    """
+    The jobs shown in the main window: the active jobs, followed by pages of
+    archived jobs fetched as the view is scrolled to the end (fetchMore).
+    Each job is a dict as returned by storage, plus a "refresh" entry: None,
+    "refreshing" while its status is being fetched, or the error that kept it stale.
+    The model keeps its rows sorted itself: a list sort on the raw values is far
+    cheaper than QSortFilterProxyModel comparing rows through data().
+    An order_id -> row index makes single-job patches O(1), or O(log n) plus a
+    row move when the patch changes the sort column.
+    All loaded jobs are kept in all_jobs; while a search is active, jobs holds
+    only the matching ones (otherwise both are the same list). Filtering here,
+    from the set of matches of a JobSearchIndex, avoids a Python
+    filterAcceptsRow call per row in a QSortFilterProxyModel. The view is
+    therefore set on this model directly.
+    """
+    COLUMNS = ["Time Started", "Product", "Order ID", "Dataset", "QC", "Status", "Actions"]
+    FIELDS = ["timestamp", "product", "order_id", "dataset_id", "qc", "last_status", None]
+    QC_COLUMN = 4
+    STATUS_COLUMN = 5
+    ACTIONS_COLUMN = 6
+
+    def __init__(self, resource_path, parent=None):
+        super().__init__(parent)
+        self.resource_path = resource_path
+        self.all_jobs = []
+        self.jobs = self.all_jobs  # visible rows
+        self.search_index = JobSearchIndex()
+        self.search_terms = []
+        self.search_field = None
+        self._by_id = {}  # order_id -> job, for all loaded jobs
+        self.archived_loaded = 0
+        self.archive_exhausted = True
+        self.sort_column = 0
+        # Newest first, like the archive pages (older jobs), which then land below the rows already shown
+        self.sort_order = Qt.DescendingOrder
+        self._rows = {}  # order_id -> visible row; None until needed after a search
+        self._icons = {}  # resource -> QIcon, each loaded from disk once
+
+    def icon(self, resource):
+        icon = self._icons.get(resource)
+        if icon is None:
+            icon = self._icons[resource] = QIcon(self.resource_path(resource))
+        return icon
+
+    # Qt model interface
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.jobs)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUMNS[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    # The roles data() answers; the view asks every cell for many more
+    ROLES = frozenset((Qt.DisplayRole, SORT_ROLE, JOB_ROLE, Qt.DecorationRole, Qt.ForegroundRole, Qt.ToolTipRole))
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role not in self.ROLES or not index.isValid():
+            return None
+        job = self.jobs[index.row()]
+        column = index.column()
+        field = self.FIELDS[column]
+        if role == JOB_ROLE:
+            return job
+        if role == Qt.DisplayRole:
+            return job[field] if field is not None and column != self.QC_COLUMN else None
+        if role == SORT_ROLE:
+            return job[field] if field is not None else ""
+        if role == Qt.DecorationRole:
+            if column == self.QC_COLUMN:
+                return self.icon(QC_ICONS.get(job["qc"], UNKNOWN_QC_ICON))
+            if column == self.STATUS_COLUMN and job.get("refresh") is not None:
+                return self.icon("resources/loading.png" if job["refresh"] == "refreshing" else UNKNOWN_QC_ICON)
+        if role == Qt.ForegroundRole:
+            return STALE_COLOR if column == self.STATUS_COLUMN and job.get("refresh") is not None else TEXT_COLOR
+        if role == Qt.ToolTipRole and column == self.STATUS_COLUMN and job.get("refresh") is not None:
+            if job["refresh"] == "refreshing":
+                return "Refreshing status..."
+            return f"Stale: could not refresh status ({job['refresh']})"
+        return None
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.sort_column = column
+        self.sort_order = order
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        persistent_jobs = [self.jobs[index.row()] for index in persistent]
+        self._sort_rows()
+        self.changePersistentIndexList(
+            persistent,
+            [self.index(self.row_of(job["order_id"]), index.column()) for job, index in zip(persistent_jobs, persistent)]
+        )
+        self.layoutChanged.emit()
+
+    def filtering(self):
+        return bool(self.search_terms)
+
+    def _sort_key(self, job):
+        return job[self.FIELDS[self.sort_column]] or ""
+
+    def _sort_rows(self):
+        if self.FIELDS[self.sort_column] is not None:
+            self.all_jobs.sort(key=self._sort_key, reverse=self.sort_order == Qt.DescendingOrder)
+        self._filter_rows()
+
+    def _filter_rows(self, matching=None):
+        """Rebuild the visible rows from all_jobs (matching: the order_ids of the search, if known)."""
+        if not self.filtering():
+            self.jobs = self.all_jobs
+        else:
+            if matching is None:
+                matching = self.search_index.search(self.search_terms, self.search_field)
+            if len(matching) == len(self.all_jobs):
+                self.jobs = list(self.all_jobs)
+            elif len(matching) * 8 < len(self.all_jobs) and self.FIELDS[self.sort_column] is not None:
+                # Few matches: sorting them is cheaper than a pass over every job
+                self.jobs = sorted(
+                    (self._by_id[order_id] for order_id in matching),
+                    key=self._sort_key, reverse=self.sort_order == Qt.DescendingOrder,
+                )
+            else:
+                self.jobs = [job for job in self.all_jobs if job["order_id"] in matching]
+        # Rebuilt on the next lookup, so that typing does not pay for it
+        self._rows = None
+
+    def _reindex(self, start, end=None):
+        """Refresh the order_id -> row index for rows start..end (default: to the last row)."""
+        if self._rows is None:
+            return
+        for row in range(start, len(self.jobs) if end is None else end):
+            self._rows[self.jobs[row]["order_id"]] = row
+
+    def _position_for(self, job, jobs=None):
+        """Row at which job belongs in jobs (default: the visible rows) in the current sort order, after equal rows."""
+        jobs = self.jobs if jobs is None else jobs
+        if self.FIELDS[self.sort_column] is None:
+            return len(jobs)
+        key = self._sort_key(job)
+        descending = self.sort_order == Qt.DescendingOrder
+        low, high = 0, len(jobs)
+        while low < high:
+            middle = (low + high) // 2
+            other = self._sort_key(jobs[middle])
+            if (key > other) if descending else (key < other):
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self.archive_exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        """Append the next page of archived jobs, with their stored status."""
+        if not self.canFetchMore(parent):
+            return
+        jobs = get_archived_jobs(offset=self.archived_loaded, limit=ARCHIVE_PAGE_SIZE)
+        self.archived_loaded += len(jobs)
+        self.archive_exhausted = len(jobs) < ARCHIVE_PAGE_SIZE
+        self.add_jobs(jobs)
+
+    # Job store operations
+
+    def set_jobs(self, jobs, refreshing=()):
+        """
+        Show these (active) jobs, and start paging the archive after them again.
+        The jobs whose order_id is in refreshing are marked as being refreshed.
+        """
+        refreshing = set(refreshing)
+        self.beginResetModel()
+        self.all_jobs = [dict(job, refresh="refreshing" if job["order_id"] in refreshing else None) for job in jobs]
+        self._by_id = {job["order_id"]: job for job in self.all_jobs}
+        self.search_index.clear()
+        self.search_index.add_many(self.all_jobs)
+        self._sort_rows()
+        self.archived_loaded = 0
+        self.archive_exhausted = False
+        self.endResetModel()
+
+    def add_jobs(self, jobs):
+        """
+        Load more jobs (archive pages, archive search results) into their place
+        in the sort order. Jobs that are already loaded are skipped.
+        """
+        jobs = [dict(job, refresh=None) for job in jobs if job["order_id"] not in self._by_id]
+        if not jobs:
+            return
+        for job in jobs:
+            self._by_id[job["order_id"]] = job
+        self.search_index.add_many(jobs)
+        visible = [job for job in jobs if self._visible(job)]
+        if visible:
+            first = len(self.jobs)
+            self.beginInsertRows(QModelIndex(), first, first + len(visible) - 1)
+        if self.jobs is not self.all_jobs:
+            self.jobs.extend(visible)
+        self.all_jobs.extend(jobs)
+        if visible:
+            self._reindex(first)
+            self.endInsertRows()
+        # New rows take their place in the current sort order
+        self.sort(self.sort_column, self.sort_order)
+
+    def _visible(self, job):
+        return not self.filtering() or JobSearchIndex.matches(job, self.search_terms, self.search_field)
+
+    def add_job(self, job):
+        """Insert one job at its place in the sort order."""
+        job = dict(job, refresh=None)
+        self._by_id[job["order_id"]] = job
+        self.search_index.add(job)
+        if self.jobs is not self.all_jobs:
+            self.all_jobs.insert(self._position_for(job, self.all_jobs), job)
+            if not self._visible(job):
+                return
+        row = self._position_for(job)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.jobs.insert(row, job)
+        self._reindex(row)
+        self.endInsertRows()
+
+    def row_of(self, order_id):
+        """Return the visible row of order_id, or None if it is not loaded or filtered out."""
+        if self._rows is None:
+            self._rows = {job["order_id"]: row for row, job in enumerate(self.jobs)}
+        return self._rows.get(order_id)
+
+    def job(self, order_id):
+        """The loaded job with this order_id, visible or not, or None."""
+        return self._by_id.get(order_id)
+
+    def update_job(self, order_id, **fields):
+        """
+        Change fields of one job (e.g. last_status, qc, refresh) and repaint its
+        row, moving the row if its place in the sort order changed, and showing
+        or hiding it if it starts or stops matching the search.
+        """
+        job = self._by_id.get(order_id)
+        if job is None:
+            return
+        job.update(fields)
+        self.search_index.update(job, fields)
+        if self.jobs is self.all_jobs:
+            row = self.row_of(order_id)
+            if self.FIELDS[self.sort_column] in fields:
+                row = self._move_to_sorted_position(row)
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.COLUMNS) - 1))
+            return
+
+        if self.FIELDS[self.sort_column] in fields:
+            self.all_jobs.remove(job)
+            self.all_jobs.insert(self._position_for(job, self.all_jobs), job)
+        row = self.row_of(order_id)
+        visible = self._visible(job)
+        if row is None:
+            if visible:
+                row = self._position_for(job)
+                self.beginInsertRows(QModelIndex(), row, row)
+                self.jobs.insert(row, job)
+                self._reindex(row)
+                self.endInsertRows()
+        elif not visible:
+            self._remove_row(row)
+        else:
+            if self.FIELDS[self.sort_column] in fields:
+                row = self._move_to_sorted_position(row)
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.COLUMNS) - 1))
+
+    def _move_to_sorted_position(self, row):
+        job = self.jobs.pop(row)
+        new_row = self._position_for(job)
+        self.jobs.insert(row, job)
+        if new_row == row:
+            return row
+        # beginMoveRows takes the destination in the row numbers from before the move
+        self.beginMoveRows(QModelIndex(), row, row, QModelIndex(), new_row if new_row < row else new_row + 1)
+        self.jobs.insert(new_row, self.jobs.pop(row))
+        self._reindex(min(row, new_row), max(row, new_row) + 1)
+        self.endMoveRows()
+        return new_row
+
+    def remove_job(self, order_id):
+        job = self._by_id.pop(order_id, None)
+        if job is None:
+            return
+        self.search_index.remove(order_id)
+        if self.jobs is not self.all_jobs:
+            self.all_jobs.remove(job)
+        row = self.row_of(order_id)
+        if row is not None:
+            self._remove_row(row)
+
+    def _remove_row(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        job = self.jobs.pop(row)
+        if self._rows is not None:
+            del self._rows[job["order_id"]]
+        self._reindex(row)
+        self.endRemoveRows()
+
+    def set_search(self, text, column=-1):
+        """
+        Show only the jobs matching the search text, in the given column or in
+        any searchable one (column -1). Returns the search terms; empty text
+        shows every loaded job again.
+        """
+        field = self.FIELDS[column] if column >= 0 else None
+        terms = tokenize(text)
+        if terms == self.search_terms and field == self.search_field:
+            return terms
+        narrowing = (
+            self.filtering() and field == self.search_field and len(terms) >= len(self.search_terms)
+            and all(term.startswith(previous) for term, previous in zip(terms, self.search_terms))
+        )
+        previous_rows = self.jobs
+        self.search_terms = terms
+        self.search_field = field
+        matching = self.search_index.search(terms, field) if terms else None
+        if narrowing and len(matching) == len(previous_rows):
+            # Still the same rows, e.g. "pa" -> "pat" while every row says "patient"
+            return terms
+        self.beginResetModel()
+        if narrowing:
+            # Typing on only narrows the search: filter the rows already shown
+            self.jobs = [job for job in previous_rows if job["order_id"] in matching]
+            self._rows = None
+        else:
+            self._filter_rows(matching)
+        self.endResetModel()
+        return terms
+
+class JobActionsDelegate(QStyledItemDelegate):
+    """
+    Paints the Result and Delete buttons of a row and turns clicks on them into
+    signals, instead of creating two QPushButtons and a container widget per row.
+    Colors follow QPushButton in resources/style.qss.
+    """
+    result_clicked = pyqtSignal(str)  # order_id
+    delete_clicked = pyqtSignal(str)  # order_id
+
+    LABELS = ("Result", "Delete")
+    SPACING = 5
+    BUTTON_COLOR = QColor("#0bc4d5")
+    HOVER_COLOR = QColor("#357ab8")
+    DISABLED_COLOR = QColor("#cccccc")
+    DISABLED_TEXT_COLOR = QColor("#666666")
+    TEXT_COLOR = QColor("#ffffff")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._hovered = None  # (row, button index) under the mouse
+
+    def _button_rects(self, rect):
+        width = (rect.width() - self.SPACING) // 2
+        return (
+            QRect(rect.left(), rect.top() + 1, width, rect.height() - 2),
+            QRect(rect.left() + width + self.SPACING, rect.top() + 1, width, rect.height() - 2),
+        )
+
+    def _enabled(self, job, button):
+        # Results only make sense once QC passed (or was skipped)
+        return button == 1 or job["qc"] not in ("FAIL", "IP")
+
+    def paint(self, painter, option, index):
+        job = index.data(JOB_ROLE)
+        painter.save()
+        for button, (label, rect) in enumerate(zip(self.LABELS, self._button_rects(option.rect))):
+            if not self._enabled(job, button):
+                background, text = self.DISABLED_COLOR, self.DISABLED_TEXT_COLOR
+            elif self._hovered == (index.row(), button):
+                background, text = self.HOVER_COLOR, self.TEXT_COLOR
+            else:
+                background, text = self.BUTTON_COLOR, self.TEXT_COLOR
+            painter.fillRect(rect, background)
+            painter.setPen(text)
+            painter.drawText(rect, Qt.AlignCenter, label)
+        painter.restore()
+
+    def _button_at(self, option, pos):
+        for button, rect in enumerate(self._button_rects(option.rect)):
+            if rect.contains(pos):
+                return button
+        return None
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseMove:
+            button = self._button_at(option, event.pos())
+            hovered = (index.row(), button) if button is not None else None
+            if hovered != self._hovered:
+                self._hovered = hovered
+                if option.widget is not None:
+                    option.widget.viewport().update()
+            return False
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            job = index.data(JOB_ROLE)
+            button = self._button_at(option, event.pos())
+            if button is not None and self._enabled(job, button):
+                (self.result_clicked if button == 0 else self.delete_clicked).emit(job["order_id"])
+                return True
+        return False
@@ -1,17 +1,34 @@
 # main_window.py
 import os
 import sys
+import threading
+from datetime import datetime
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
-    QLineEdit, QFileDialog, QTableWidget, QTableWidgetItem, 
+    QLineEdit, QFileDialog, QTableView, QHeaderView,
     QProgressBar, QMessageBox, QDialog, QComboBox, QDialogButtonBox, QTextEdit,
     QStatusBar, QToolBar, QAction, QInputDialog, QStackedWidget,
-    QGridLayout, QToolButton, QFormLayout
+    QGridLayout, QToolButton, QFormLayout, QListView, QTreeView, QAbstractItemView,
+    QFileSystemModel, QSystemTrayIcon, QApplication
 )
-from PyQt5.QtGui import QPixmap, QIcon, QColor, QFont, QMovie, QDesktopServices
+from PyQt5.QtGui import QPixmap, QIcon, QFont, QMovie, QDesktopServices
 from PyQt5.QtCore import Qt, QThread, pyqtSignal, QSize, QUrl, QTimer
-from storage import get_api_key, set_api_key, add_job, get_jobs, remove_job, update_job_field
-from sdk_client import SDKClient
+from storage import (
+    get_api_key, set_api_key, add_job, get_jobs, get_job, remove_job,
+    update_jobs, remove_jobs, is_terminal_status, search_archived_jobs
+)
+from sdk_client import SDKClient, CheckCancelled, UnsupportedSDK
+import startup_profile
+from ui.upload_queue import UploadQueue, UploadQueueWidget, UploadTask, format_bytes
+from ui.task_dispatcher import TaskDispatcher, TaskQueueWidget
+from ui.results_view import ResultsImageDialog
+from ui.export_dialog import ExportResultsDialog, ExportProgress
+from ui.qc_scheduler import QCScheduler
+from ui.status_poller import StatusPoller
+from ui.jobs_model import JobsTableModel, JobActionsDelegate, JobSearchIndex, JOB_ROLE
+
+# Milliseconds of typing pause before the jobs search runs
+SEARCH_DEBOUNCE_MS = 200
 
 class EmailReportDialog(QDialog):
     def __init__(self, parent=None):
@@ -43,38 +60,57 @@ class EmailReportDialog(QDialog):
         """Return a tuple of (start_date, end_date) entered by the user."""
         return self.start_date_edit.text().strip(), self.end_date_edit.text().strip()
 
-class UploadWorker(QThread):
-    progress_signal = pyqtSignal(int)
+class StatusRefreshWorker(QThread):
+    status_signal = pyqtSignal(str, object, object)  # order_id, status, error
 
-    def __init__(self, sdk_client, order_id, dataset_path):
+    def __init__(self, sdk_client, order_ids):
         super().__init__()
         self.sdk_client = sdk_client
-        self.order_id = order_id
-        self.dataset_path = dataset_path
+        self.order_ids = order_ids
+        self._cancel_event = threading.Event()
+        # Filled in on the UI thread, stored once the refresh is over
+        self.status_changes = {}
+        self.incompatible_jobs = []
+
+    def cancel(self):
+        self._cancel_event.set()
 
     def run(self):
-        def progress_callback(value):
-            int_val = int(value)
-            self.progress_signal.emit(int_val)
-        self.sdk_client.upload(self.order_id, self.dataset_path, progress_callback)
+        self.sdk_client.check_status_many(
+            self.order_ids,
+            callback=lambda order_id, status, error: self.status_signal.emit(order_id, status, error),
+            cancel_event=self._cancel_event,
+        )
+
+class ArchiveSearchWorker(QThread):
+    """Looks up the archived jobs matching a search, which the table has not paged in yet."""
+    results_signal = pyqtSignal(object, object)  # worker, jobs
+
+    def __init__(self, terms, field, parent=None):
+        super().__init__(parent)
+        self.terms = terms
+        self.field = field
+
+    def run(self):
+        fields = JobSearchIndex.FIELDS if self.field is None else (self.field,)
+        try:
+            jobs = search_archived_jobs(self.terms, fields)
+        except Exception as e:
+            print(f"Archive search failed: {e}")
+            jobs = []
+        self.results_signal.emit(self, [job for job in jobs if JobSearchIndex.matches(job, self.terms, self.field)])
 
 class ResultsDialog(QDialog):
+    """Text results (JSON, TXT, XML); image results are shown by ResultsImageDialog."""
     def __init__(self, results_data, format_type, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Results")
         layout = QVBoxLayout()
 
-        if format_type == "PNG":
-            pixmap = QPixmap()
-            pixmap.loadFromData(results_data.getvalue())
-            label = QLabel()
-            label.setPixmap(pixmap)
-            layout.addWidget(label)
-        else:
-            text_edit = QTextEdit()
-            text_edit.setReadOnly(True)
-            text_edit.setPlainText(results_data)
-            layout.addWidget(text_edit)
+        text_edit = QTextEdit()
+        text_edit.setReadOnly(True)
+        text_edit.setPlainText(results_data)
+        layout.addWidget(text_edit)
 
         # Add a button to save results
         button_box = QDialogButtonBox(QDialogButtonBox.Save | QDialogButtonBox.Close)
@@ -88,9 +124,7 @@ class ResultsDialog(QDialog):
 
     def save_results(self):
         file_filter = ""
-        if self.format_type == "PNG":
-            file_filter = "PNG Image (*.png)"
-        elif self.format_type == "JSON":
+        if self.format_type == "JSON":
             file_filter = "JSON File (*.json)"
         elif self.format_type == "TXT":
             file_filter = "Text File (*.txt)"
@@ -99,8 +133,8 @@ class ResultsDialog(QDialog):
 
         path, _ = QFileDialog.getSaveFileName(self, "Save Results", "", file_filter)
         if path:
-            with open(path, "wb" if self.format_type == "PNG" else "w") as f:
-                f.write(self.results_data.getvalue())
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(self.results_data)
 
 
 class MainWindow(QMainWindow):
@@ -108,10 +142,13 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.sdk_client = SDKClient()
         self.api_key = get_api_key()
-        self.dataset_path = None
+        self.status_worker = None  # StatusRefreshWorker refreshing the jobs table, if any
 
         self.setWindowTitle("neuropacsUI")
-        self.setWindowIcon(QIcon(self.resource_path("resources/logo.png")))
+        # The logo is decoded once and shared by the window icon and both pages
+        logo_path = self.resource_path("resources/logo.png")
+        logo_pixmap = QPixmap(logo_path) if os.path.exists(logo_path) else QPixmap()
+        self.setWindowIcon(QIcon(logo_pixmap))
 
         # Adjust window size for a wider UI
         self.resize(1000, 600)
@@ -121,10 +158,14 @@ class MainWindow(QMainWindow):
         if os.path.exists(style_path):
             with open(style_path, "r") as style_file:
                 self.setStyleSheet(style_file.read())
+        startup_profile.mark("stylesheet loaded")
 
         # Menu bar
         menubar = self.menuBar()
         file_menu = menubar.addMenu("File")
+        self.export_results_action = QAction("Export Results...", self)
+        self.export_results_action.triggered.connect(self.export_results)
+        file_menu.addAction(self.export_results_action)
         exit_action = file_menu.addAction("Exit")
         exit_action.triggered.connect(self.close)
 
@@ -132,6 +173,11 @@ class MainWindow(QMainWindow):
         self.statusbar = QStatusBar()
         self.setStatusBar(self.statusbar)
 
+        # Every SDK call is made through the dispatcher, never on the UI thread; its queue shows in the status bar
+        self.task_dispatcher = TaskDispatcher(parent=self)
+        self.task_queue_widget = TaskQueueWidget(self.task_dispatcher)
+        self.statusbar.addPermanentWidget(self.task_queue_widget)
+
         # Create the stacked widget to hold two pages
         self.stacked_widget = QStackedWidget()
         
@@ -142,9 +188,8 @@ class MainWindow(QMainWindow):
 
         # Logo
         logo_label = QLabel()
-        logo_path = self.resource_path("resources/logo.png")
-        if os.path.exists(logo_path):
-            pixmap = QPixmap(logo_path).scaledToHeight(80, Qt.SmoothTransformation)
+        if not logo_pixmap.isNull():
+            pixmap = logo_pixmap.scaledToHeight(80, Qt.SmoothTransformation)
             logo_label.setPixmap(pixmap)
         logo_label.setAlignment(Qt.AlignCenter)
         
@@ -185,6 +230,8 @@ class MainWindow(QMainWindow):
         send_email_action.triggered.connect(self.open_email_report_dialog)
         self.toolbar.addAction(send_email_action)
 
+        self.toolbar.addAction(self.export_results_action)
+
         self.qc_toggle_button = QToolButton(self)
         self.qc_toggle_button.setText("QC")
         self.qc_toggle_button.setCheckable(True)
@@ -205,6 +252,14 @@ class MainWindow(QMainWindow):
         """)
         self.toolbar.addWidget(self.qc_toggle_button)
         self.qc_enabled = True  # This state is still accessible in your code
+        # QC of every uploaded order is polled on one shared tick, off the UI thread
+        self.qc_scheduler = QCScheduler(self.sdk_client, self.task_dispatcher, parent=self)
+        self.qc_scheduler.qc_finished.connect(self.after_qc_check)
+        # Running jobs are polled in the background and their rows patched as statuses change
+        self.status_poller = StatusPoller(self.sdk_client, self.task_dispatcher, parent=self)
+        self.status_poller.status_changed.connect(self.on_polled_status)
+        self.status_poller.job_finished.connect(self.notify_job_finished)
+        self.tray_icon = None
 
         # Create the top frame as QWidget (no borders)
         top_frame = QWidget()
@@ -218,8 +273,8 @@ class MainWindow(QMainWindow):
 
         # Create a QLabel for the logo
         self.logo_label = QLabel()
-        if os.path.exists(logo_path):
-            pixmap = QPixmap(logo_path).scaled(
+        if not logo_pixmap.isNull():
+            pixmap = logo_pixmap.scaled(
                 50, 50, Qt.KeepAspectRatio, Qt.SmoothTransformation
             )
             self.logo_label.setPixmap(pixmap)
@@ -244,15 +299,28 @@ class MainWindow(QMainWindow):
         middle_layout = QVBoxLayout(middle_frame)
         middle_layout.setSpacing(15)
 
-        self.upload_button = QPushButton("Upload DICOM Dataset")
+        self.upload_button = QPushButton("Upload DICOM Datasets")
         self.upload_button.setEnabled(True)
         self.upload_button.clicked.connect(self.select_and_upload)
 
+        # Aggregate progress of all pending uploads
         self.progress_bar = QProgressBar()
         self.progress_bar.setValue(0)
 
+        # Uploads are queued and run a few at a time; datasets can also be dropped on the window
+        self.upload_queue = UploadQueue(self.sdk_client, parent=self)
+        self.upload_queue.task_updated.connect(self.on_upload_progress)
+        self.upload_queue.task_finished.connect(self.on_upload_task_finished)
+        self.upload_queue.duplicate_found.connect(self.on_upload_duplicate)
+        self.upload_queue_widget = UploadQueueWidget(self.upload_queue)
+        resumable = self.upload_queue.pending_tasks()
+        if resumable:
+            self.statusbar.showMessage(f"{len(resumable)} interrupted upload(s) can be resumed.", 10000)
+        self.setAcceptDrops(True)
+
         middle_layout.addWidget(self.upload_button)
         middle_layout.addWidget(self.progress_bar)
+        middle_layout.addWidget(self.upload_queue_widget)
 
         self.main_page_layout.addWidget(middle_frame)
 
@@ -260,18 +328,54 @@ class MainWindow(QMainWindow):
         bottom_frame = QWidget()
         bottom_layout = QVBoxLayout(bottom_frame)
 
-        self.jobs_table = QTableWidget(0, 7)
-        self.jobs_table.setHorizontalHeaderLabels(["Time Started", "Product", "Order ID", "Dataset", "QC", "Status", "Actions"])
-        self.jobs_table.setAlternatingRowColors(True)
-        self.jobs_table.horizontalHeader().setStretchLastSection(True)
-        self.jobs_table.setColumnWidth(0, 120)
-        self.jobs_table.setColumnWidth(1, 100)
-        self.jobs_table.setColumnWidth(2, 100)
-        self.jobs_table.setColumnWidth(3, 100)
-        self.jobs_table.setColumnWidth(4, 30)
-        self.jobs_table.setColumnWidth(5, 300)
-        bottom_layout.addWidget(self.jobs_table)
-        self.jobs_table.setSortingEnabled(False)
+        # Search bar: the model filters through its token index once typing pauses
+        search_layout = QHBoxLayout()
+        self.search_lineedit = QLineEdit()
+        self.search_lineedit.setPlaceholderText("Search jobs (order ID, dataset, product, QC, status)...")
+        self.search_lineedit.setClearButtonEnabled(True)
+        self.search_column_combo = QComboBox()
+        self.search_column_combo.addItem("Any Column", -1)
+        for column in (2, 3, 1, 4, 5):
+            self.search_column_combo.addItem(JobsTableModel.COLUMNS[column], column)
+        self.clear_filter_button = QPushButton("Clear")
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.on_search)
+        self.search_lineedit.textChanged.connect(self.search_timer.start)
+        self.search_lineedit.returnPressed.connect(self.on_search)
+        self.search_column_combo.currentIndexChanged.connect(self.on_search)
+        self.clear_filter_button.clicked.connect(self.on_clear_filter)
+        self.archive_search_worker = None
+        search_layout.addWidget(self.search_lineedit)
+        search_layout.addWidget(self.search_column_combo)
+        search_layout.addWidget(self.clear_filter_button)
+        bottom_layout.addLayout(search_layout)
+
+        # Jobs are a model over the job store; the view only materializes the visible rows
+        self.jobs_model = JobsTableModel(self.resource_path, self)
+        self.jobs_view = QTableView()
+        self.jobs_view.setModel(self.jobs_model)
+        self.jobs_view.setAlternatingRowColors(True)
+        self.jobs_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.jobs_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.jobs_view.setMouseTracking(True)
+        self.jobs_view.horizontalHeader().setStretchLastSection(True)
+        self.jobs_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.jobs_view.setColumnWidth(0, 120)
+        self.jobs_view.setColumnWidth(1, 100)
+        self.jobs_view.setColumnWidth(2, 100)
+        self.jobs_view.setColumnWidth(3, 100)
+        self.jobs_view.setColumnWidth(4, 30)
+        self.jobs_view.setColumnWidth(5, 300)
+        self.jobs_actions_delegate = JobActionsDelegate(self.jobs_view)
+        # Queued, so that dialogs open after the click has been handled by the view
+        self.jobs_actions_delegate.result_clicked.connect(self.check_status, Qt.QueuedConnection)
+        self.jobs_actions_delegate.delete_clicked.connect(self.delete_job, Qt.QueuedConnection)
+        self.jobs_view.setItemDelegateForColumn(JobsTableModel.ACTIONS_COLUMN, self.jobs_actions_delegate)
+        self.jobs_view.setSortingEnabled(True)
+        self.jobs_view.sortByColumn(0, Qt.DescendingOrder)
+        bottom_layout.addWidget(self.jobs_view)
 
         self.main_page_layout.addWidget(bottom_frame)
 
@@ -292,7 +396,7 @@ class MainWindow(QMainWindow):
         self.spinner_movie = QMovie(spinner_gif_path)
         self.spinner_movie.setScaledSize(QSize(16, 16))  # Smaller spinner size
         self.spinner_label.setMovie(self.spinner_movie)
-        self.spinner_movie.start()
+        # The animation only runs while the spinner is shown (see show_spinner)
 
         # Spinner message
         self.spinner_message = QLabel("Processing...")
@@ -347,29 +451,31 @@ class MainWindow(QMainWindow):
         self.stacked_widget.addWidget(self.api_page)
         self.stacked_widget.addWidget(self.main_page)
 
-        # Attempt auto-connection if API key stored
+        # With a stored API key, show the locally known jobs at once and connect in the background
         if self.api_key:
-            try:
-                self.sdk_client.connect(self.api_key)
-                self.on_connection_success()
-            except Exception:
-                self.stacked_widget.setCurrentWidget(self.api_page)
+            self.stacked_widget.setCurrentWidget(self.main_page)
         else:
             self.stacked_widget.setCurrentWidget(self.api_page)
 
         self.setCentralWidget(self.stacked_widget)
+        startup_profile.mark("pages built")
 
-        # Populate table if connected
-        if self.stacked_widget.currentWidget() == self.main_page:
-            self.populate_jobs_table()
+        if self.api_key:
+            self.populate_jobs_table(refresh=False)
+            startup_profile.mark("jobs table populated")
+            self.start_connect(self.api_key, interactive=False)
 
     def open_email_report_dialog(self):
         """Opens a dialog to input dates and then calls the SDK function with these dates."""
         dialog = EmailReportDialog(self)
         if dialog.exec_() == QDialog.Accepted:
             start_date, end_date = dialog.get_dates()
-            res = self.sdk_client.getReport(start_date=start_date, end_date=end_date)
-            QMessageBox.information(self, "Report Sent", res)
+            self.task_dispatcher.submit(
+                self.sdk_client.getReport, start_date=start_date, end_date=end_date,
+                key=("report", start_date, end_date), label="Sending report", timeout=120,
+                on_result=lambda res: QMessageBox.information(self, "Report Sent", res),
+                on_error=lambda e: QMessageBox.warning(self, "Error", f"Failed to send the report: {e}"),
+            )
             
 
     def resource_path(self, relative_path):
@@ -381,20 +487,48 @@ class MainWindow(QMainWindow):
 
     def connect_to_service(self):
         entered_api_key = self.api_key_line.text().strip()
-        try:
-            self.sdk_client.connect(entered_api_key)
-            set_api_key(entered_api_key)
-            self.api_key = entered_api_key
+        self.start_connect(entered_api_key, interactive=True)
+
+    def start_connect(self, api_key, interactive):
+        """
+        Connect to neuropacs on a worker thread. The result is reported through
+        the worker's signals, so the window stays responsive (and usable offline).
+        """
+        self.api_connect_button.setEnabled(False)
+        self.statusbar.showMessage("Connecting...")
+        self.task_dispatcher.submit(
+            self.sdk_client.connect, api_key, key=("connect", api_key), label="Connecting",
+            on_result=lambda _: self.on_connected(api_key, interactive),
+            # An unsupported SDK is reported even when reconnecting with the saved key at startup
+            on_error=lambda error: self.on_connect_failed(str(error), interactive or isinstance(error, UnsupportedSDK)),
+        )
+
+    def on_connected(self, api_key, interactive):
+        self.api_connect_button.setEnabled(True)
+        if interactive:
+            set_api_key(api_key)
+            self.api_key = api_key
             self.statusbar.showMessage("Connected successfully!", 5000)
-            self.on_connection_success()
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Connection failed: {e}")
-            self.statusbar.showMessage("Connection failed.", 5000)
+        else:
+            self.statusbar.clearMessage()
+        self.on_connection_success()
+
+    def on_connect_failed(self, error, interactive):
+        self.api_connect_button.setEnabled(True)
+        if interactive:
+            QMessageBox.warning(self, "Error", f"Connection failed: {error}")
+        else:
+            self.stacked_widget.setCurrentWidget(self.api_page)
+        self.statusbar.showMessage("Connection failed.", 5000)
 
     def on_connection_success(self):
         self.stacked_widget.setCurrentWidget(self.main_page)
         # Remove jobs that are incompatible with new key
         self.populate_jobs_table()
+        # Orders still in QC when the app last closed
+        jobs = get_jobs()
+        self.qc_scheduler.resume(jobs)
+        self.status_poller.watch_jobs(jobs)
 
     def show_spinner(self, message="Processing..."):
         """
@@ -412,310 +546,277 @@ class MainWindow(QMainWindow):
         self.spinner_movie.stop()
 
     def select_and_upload(self):
-        dataset_path = QFileDialog.getExistingDirectory(self, "Select DICOM Directory", "")
-        if dataset_path:
-            self.show_spinner("Uploading dataset...")
-            self.upload_button.setEnabled(False)
-            self.dataset_path = dataset_path
-            order_id = self.sdk_client.newJob()
-            folder_name = os.path.basename(self.dataset_path.rstrip("/\\"))
-            self.statusbar.showMessage(f"Uploading dataset for job {order_id}...")
-            self.upload_worker = UploadWorker(self.sdk_client, order_id, dataset_path)
-            self.upload_worker.progress_signal.connect(self.on_upload_progress)
-            # Connect to a dedicated handler to show/hide spinner
-            self.upload_worker.finished.connect(lambda: self.handle_upload_complete(order_id, folder_name))
-            self.upload_worker.start()
-
-    def handle_upload_complete(self, order_id, folder_name):
-        """
-        Handle the upload completion with spinner visibility management.
-        """
-        self.on_upload_complete(order_id, folder_name)
-        self.hide_spinner()
-
-    def on_upload_progress(self, value):
-        self.progress_bar.setValue(value)
-
-    def is_valid_qc_obj(self, qc_results):
-        if isinstance(qc_results, (list, tuple)) and len(qc_results) >= 12:
-            main_status = qc_results[11]
-            return main_status
+        # A non-native directory dialog is the only portable way to select several directories
+        dialog = QFileDialog(self, "Select DICOM Directories")
+        dialog.setFileMode(QFileDialog.Directory)
+        dialog.setOption(QFileDialog.ShowDirsOnly, True)
+        dialog.setOption(QFileDialog.DontUseNativeDialog, True)
+        for view in dialog.findChildren((QListView, QTreeView)):
+            if isinstance(view.model(), QFileSystemModel):
+                view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        if dialog.exec_() == QDialog.Accepted:
+            self.queue_uploads(dialog.selectedFiles())
+
+    def dragEnterEvent(self, event):
+        if event.mimeData().hasUrls() and self.stacked_widget.currentWidget() == self.main_page:
+            event.acceptProposedAction()
+
+    def dropEvent(self, event):
+        self.queue_uploads([url.toLocalFile() for url in event.mimeData().urls()])
+        event.acceptProposedAction()
+
+    def queue_uploads(self, dataset_paths):
+        dataset_paths = [path for path in dataset_paths if os.path.isdir(path)]
+        if dataset_paths:
+            self.upload_queue.add(dataset_paths)
+            self.statusbar.showMessage(f"Queued {len(dataset_paths)} dataset(s) for upload.", 5000)
+
+    def on_upload_progress(self, task=None):
+        pending = self.upload_queue.pending_tasks()
+        percent, bytes_per_sec = self.upload_queue.aggregate()
+        self.progress_bar.setValue(percent)
+        if pending:
+            self.show_spinner(f"Uploading {len(pending)} dataset(s)... {format_bytes(bytes_per_sec)}/s")
         else:
-            return None
+            self.hide_spinner()
 
-    def is_qc_fail_obj(self, qc_results):
-        if isinstance(qc_results, (dict)) and qc_results.get("status", None) != None:
-            return qc_results.get("status", None)
+    def on_upload_duplicate(self, task, matches):
+        """Offer to reuse the most recent earlier upload of the same dataset instead of uploading it again."""
+        latest = matches[-1]
+        message_box = QMessageBox(self)
+        message_box.setIcon(QMessageBox.Question)
+        message_box.setWindowTitle("Dataset Already Uploaded")
+        message_box.setText(
+            f"The DICOM instances in {task.dataset_id} were already uploaded as order {latest['order_id']}"
+            f" ({latest['dataset_path']}, {latest['created']})."
+        )
+        message_box.setInformativeText("Use the existing order and its results, or upload the dataset again as a new job?")
+        reuse_button = message_box.addButton("Use Existing Order", QMessageBox.AcceptRole)
+        message_box.addButton("Upload Again", QMessageBox.RejectRole)
+        message_box.setDefaultButton(reuse_button)
+        message_box.exec_()
+        reuse = message_box.clickedButton() == reuse_button
+        self.upload_queue.resolve_duplicate(task, latest["order_id"] if reuse else None)
+
+    def reuse_order(self, order_id, dataset_id, product="Atypical/MSAp/PSP-v1.0"):
+        """Show an earlier order of a re-selected dataset, tracking it again if it was removed from the list."""
+        if get_job(order_id) is None:
+            timestamp = str(datetime.now())
+            add_job(order_id, dataset_id, product, "NA", timestamp)
+            self.add_job_to_table(order_id, dataset_id, product, timestamp, "NA", "Unknown")
+        self.statusbar.showMessage(f"{dataset_id} was already uploaded as order {order_id}.", 5000)
+        self.status_poller.watch(order_id, get_job(order_id)["last_status"])
+        self.check_status(order_id)
+
+    def on_upload_task_finished(self, task):
+        if task.state == UploadTask.DONE:
+            self.on_upload_complete(task.order_id, task.dataset_id)
+        elif task.state == UploadTask.REUSED:
+            self.reuse_order(task.order_id, task.dataset_id)
+        elif task.state == UploadTask.FAILED:
+            self.statusbar.showMessage(f"Upload of {task.dataset_id} failed: {task.error}", 5000)
         else:
-            return None
+            self.statusbar.showMessage(f"Upload of {task.dataset_id} cancelled.", 5000)
+        self.on_upload_progress()
 
-    def set_qc_results(self, order_id, callback):
+    def on_upload_complete(self, order_id, dataset_id, product="Atypical/MSAp/PSP-v1.0"):
         """
-        Periodically check QC status every 10 seconds (max 3 minutes).
-        Once a QC result (PASS or FAIL) is obtained (or max time reached),
-        update the job and call the callback with a Boolean (True for PASS, False otherwise).
+        Called once the dataset of order_id has been uploaded completely.
+        With QC on, the order joins the QC scheduler, which starts its job if QC passes.
         """
-        self.qc_elapsed = 0  # seconds elapsed
-        self.qc_timer = QTimer(self)
-        self.qc_timer.setInterval(10000)  # 10 seconds in milliseconds
-
-        def check_qc():
-            qc_results = self.sdk_client.qcCheck(order_id)
-            final_qc_status = self.is_valid_qc_obj(qc_results)
-            qc_failed_status = self.is_qc_fail_obj(qc_results)
-
-            if final_qc_status is not None:
-                self.qc_timer.stop()
-                if final_qc_status["Status"] == "PASS":
-                    update_job_field(order_id, "qc", "PASS")
-                    callback(True)
-                elif final_qc_status["Status"] == "FAIL":
-                    update_job_field(order_id, "qc", "FAIL")
-                    callback(False)
-            elif qc_failed_status is not None:
-                self.qc_timer.stop()
-                update_job_field(order_id, "qc", "FAIL")
-                callback(False)
-            else:
-                self.qc_elapsed += 10
-                # if self.qc_elapsed >= 180:
-                if self.qc_elapsed >= 300:
-                    # Timeout reached after 3 minutes
-                    self.qc_timer.stop()
-                    update_job_field(order_id, "qc", "FAIL")
-                    callback(False)
-
-        # Connect the timer so that check_qc runs every 10 seconds.
-        self.qc_timer.timeout.connect(check_qc)
-        # Check immediately before starting the timer.
-        check_qc()
-        self.qc_timer.start()
-
-    def on_upload_complete(self, order_id, dataset_id, product="Atypical/MSAp/PSP-v1.0"):
-        if self.progress_bar.value() == 100:
-            if self.qc_enabled == True:
-                # Stop any existing timer
-                if hasattr(self, 'qc_timer') and self.qc_timer.isActive():
-                    self.qc_timer.stop()
-                from datetime import datetime
-                timestamp = str(datetime.now())
-                add_job(order_id, dataset_id, product, "IP", timestamp) 
-                self.add_job_to_table(order_id, dataset_id, product, timestamp, "IP", "QC Running...")
-                self.set_qc_results(order_id, 
-                    lambda qc_result: self.after_qc_check(qc_result, order_id)
-                )
-                self.hide_spinner()
-            else:
-                success = self.sdk_client.runJob(order_id)
-                if success:
-                    from datetime import datetime
-                    timestamp = str(datetime.now())
-                    add_job(order_id, dataset_id, product, "NA", timestamp) 
-                    self.add_job_to_table(order_id, dataset_id, product, timestamp, "NA", "0% - Initializing")
-                    self.statusbar.showMessage(f"Job {order_id} started successfully!", 5000)
-                    QMessageBox.information(self, "Job Started", f"Job {order_id} started successfully!")
-        self.progress_bar.setValue(0)
-        self.upload_button.setEnabled(True)
+        if self.qc_enabled == True:
+            timestamp = str(datetime.now())
+            add_job(order_id, dataset_id, product, "IP", timestamp) 
+            self.add_job_to_table(order_id, dataset_id, product, timestamp, "IP", "QC Running...")
+            self.qc_scheduler.add(order_id)
+        else:
+            self.task_dispatcher.submit(
+                self.sdk_client.runJob, order_id, key=("run", order_id), label=f"Starting job {order_id}",
+                on_result=lambda success: self.on_job_run(order_id, dataset_id, product, success),
+                on_error=lambda e: QMessageBox.warning(self, "Error", f"Failed to start job {order_id}: {e}"),
+            )
 
-    def after_qc_check(self, qc_result, order_id):
-        if qc_result:
-            # Only start the job if QC passed.
-            success = self.sdk_client.runJob(order_id)
-            if success:
-                update_job_field(order_id, "qc", "PASS")
+    def on_job_run(self, order_id, dataset_id, product, success):
+        if success:
+            timestamp = str(datetime.now())
+            add_job(order_id, dataset_id, product, "NA", timestamp) 
+            self.add_job_to_table(order_id, dataset_id, product, timestamp, "NA", "0% - Initializing")
+            self.status_poller.watch(order_id, "0% - Initializing", just_started=True)
+            self.statusbar.showMessage(f"Job {order_id} started successfully!", 5000)
+            QMessageBox.information(self, "Job Started", f"Job {order_id} started successfully!")
+
+    def after_qc_check(self, order_id, outcome, run_error):
+        """Store the QC outcome of an order; on PASS the scheduler already started its job."""
+        if get_job(order_id) is None:
+            return  # deleted meanwhile
+        if outcome == "PASS":
+            if run_error is None:
+                self.patch_job(order_id, qc="PASS", last_status="0% - Initializing")
+                self.status_poller.watch(order_id, "0% - Initializing", just_started=True)
                 self.statusbar.showMessage(f"Job {order_id} started successfully!", 5000)
                 QMessageBox.information(self, "Job Started", f"Job {order_id} started successfully!")
-                self.progress_bar.setValue(0)
+            else:
+                self.patch_job(order_id, qc="PASS")
+                QMessageBox.warning(self, "Error", f"QC for job {order_id} passed, but the job could not start: {run_error}")
         else:
-            update_job_field(order_id, "last_status", "QC failed")
-            QMessageBox.warning(self, "QC Failed", f"QC check for job {order_id} failed or timed out. Job will not run.")
-
-        self.populate_jobs_table()
+            self.patch_job(order_id, qc="FAIL", last_status="QC failed")
+            reason = "timed out" if outcome == "TIMEOUT" else "failed"
+            QMessageBox.warning(self, "QC Failed", f"QC check for job {order_id} {reason}. Job will not run.")
 
     def on_search(self):
         """
         Filter the table rows based on the search text and selected column.
+        Loaded jobs are filtered at once; matching archived jobs that are not
+        paged in yet are looked up in the background and added as they arrive.
         """
-        search_text = self.search_lineedit.text().strip().lower()
-        # Get the data attribute for which column to filter on
-        column_index = self.search_column_combo.currentData()  # Returns -1 for 'Any Column'
-
-        if not search_text:
-            # If there's no search text, show all rows
-            self.on_clear_filter()
-            return
-
-        # Iterate through each row
-        row_count = self.jobs_table.rowCount()
-        for row in range(row_count):
-            match_found = False
-
-            # If column_index == -1 => check all columns 0..4
-            columns_to_check = range(0, 5) if column_index == -1 else [column_index]
-
-            for col in columns_to_check:
-                item = self.jobs_table.item(row, col)
-                if item and search_text in item.text().lower():
-                    match_found = True
-                    break  # No need to check other columns if found
-
-            # Hide the row if match not found
-            self.jobs_table.setRowHidden(row, not match_found)
+        self.search_timer.stop()
+        column_index = self.search_column_combo.currentData()  # -1 for 'Any Column'
+        terms = self.jobs_model.set_search(self.search_lineedit.text(), column_index)
+        self.archive_search_worker = None
+        if terms and self.jobs_model.canFetchMore():
+            worker = ArchiveSearchWorker(terms, self.jobs_model.search_field, self)
+            worker.results_signal.connect(self.on_archive_search_results)
+            worker.finished.connect(worker.deleteLater)
+            self.archive_search_worker = worker
+            worker.start()
+
+    def on_archive_search_results(self, worker, jobs):
+        # Results of a search that was since replaced are dropped
+        if worker is self.archive_search_worker:
+            self.archive_search_worker = None
+            self.jobs_model.add_jobs(jobs)
 
     def on_clear_filter(self):
         """
         Clear any filtering so all rows become visible.
         """
-        row_count = self.jobs_table.rowCount()
-        for row in range(row_count):
-            self.jobs_table.setRowHidden(row, False)
         self.search_lineedit.clear()
+        self.on_search()
 
-    def on_sort(self):
+    def populate_jobs_table(self, refresh=True):
         """
-        Sort the jobs table by the selected column and order.
+        Show the active jobs at once, with their stored statuses; archived jobs
+        are paged in by the model as the table is scrolled to the end.
+        With refresh=True the statuses of running jobs are then refreshed on a
+        StatusRefreshWorker, and each row is patched as its result arrives.
         """
-        column_index = self.sort_column_combo.currentData()
-        order = self.sort_order_combo.currentData()  # Qt.AscendingOrder or Qt.DescendingOrder
-        
-        # Ensure sorting is enabled
-        self.jobs_table.setSortingEnabled(True)
-        self.jobs_table.sortItems(column_index, order)
-
-    def populate_jobs_table(self):
-        self.jobs_table.setRowCount(0)
-        jobs = get_jobs()   # returns a list of dicts
+        self.cancel_status_refresh()
+        jobs = get_jobs()   # returns a list of active (non-archived) job dicts
         for job in jobs:
-            try:
-                # if not job["last_status"] == "Finished":  # Do not recheck if job is already finished (or always check on new key)
-                if job['qc'] != "FAIL":
-                    new_status = self.sdk_client.checkStatus(job["order_id"])
-                    if not new_status == job["last_status"]: # update status of each job on render
-                        update_job_field(job["order_id"], "last_status", new_status)
-                        job["last_status"] = new_status
-                self.add_job_to_table(job["order_id"], job["dataset_id"], job["product"], job["timestamp"], job["qc"], job["last_status"])
-            except Exception as e:
-                if "API key incompatible." in str(e):
-                    #! Need to delete file here
-                    remove_job(job["order_id"])
-                    continue
-        self.jobs_table.setSortingEnabled(True)
-        self.jobs_table.sortItems(0, Qt.AscendingOrder)
-        self.make_table_non_editable()
+            # Finished/failed jobs are served from the status cache instead of being re-polled
+            self.sdk_client.prime_status(job["order_id"], job["last_status"])
+        order_ids = [
+            job["order_id"] for job in jobs
+            if job["qc"] != "FAIL" and not is_terminal_status(job["last_status"])
+        ] if refresh else []
+        self.jobs_model.set_jobs(jobs, refreshing=order_ids)
+        if not order_ids:
+            return
+        worker = StatusRefreshWorker(self.sdk_client, order_ids)
+        worker.status_signal.connect(lambda order_id, status, error, w=worker: self.on_status_refreshed(w, order_id, status, error))
+        worker.finished.connect(lambda w=worker: self.on_status_refresh_finished(w))
+        self.status_worker = worker
+        self.statusbar.showMessage(f"Refreshing the status of {len(order_ids)} job(s)...")
+        worker.start()
+
+    def cancel_status_refresh(self):
+        """Stop the status refresh in progress, e.g. because the API key is being switched."""
+        if self.status_worker is not None:
+            self.status_worker.cancel()
+            self.status_worker = None
+            self.statusbar.clearMessage()
+
+    def on_status_refreshed(self, worker, order_id, status, error):
+        if worker is not self.status_worker or isinstance(error, CheckCancelled):
+            return
+        if error is not None:
+            if "API key incompatible." in str(error):
+                worker.incompatible_jobs.append(order_id)
+                self.jobs_model.remove_job(order_id)
+                self.status_poller.unwatch(order_id)
+            else:
+                self.jobs_model.update_job(order_id, refresh=str(error))
+            return
+        job = self.jobs_model.job(order_id)
+        if job is not None and job["last_status"] != status:
+            worker.status_changes[order_id] = {"last_status": status}
+        self.jobs_model.update_job(order_id, last_status=status, refresh=None)
+        self.status_poller.observe(order_id, status)
+
+    def on_status_refresh_finished(self, worker):
+        # Whatever arrived is stored, even if the refresh was cancelled; jobs deleted meanwhile are left out
+        update_jobs({
+            order_id: fields for order_id, fields in worker.status_changes.items() if get_job(order_id) is not None
+        })
+        remove_jobs(worker.incompatible_jobs)
+        worker.deleteLater()
+        if worker is self.status_worker:
+            self.status_worker = None
+            self.statusbar.showMessage("Job statuses refreshed.", 5000)
+
+    def patch_job(self, order_id, **fields):
+        """
+        Change stored fields of one job (e.g. qc, last_status) and patch its row
+        in place; the rest of the table is left alone.
+        """
+        update_jobs({order_id: fields})
+        self.jobs_model.update_job(order_id, refresh=None, **fields)
+
+    def on_polled_status(self, order_id, status):
+        if get_job(order_id) is not None:
+            self.patch_job(order_id, last_status=status)
+
+    def notify_job_finished(self, order_id, status):
+        """Tell the user a job finished, without a modal dialog: status bar, tray message and taskbar alert."""
+        message = f"Job {order_id}: {status}"
+        self.statusbar.showMessage(message, 10000)
+        if self.tray_icon is None and QSystemTrayIcon.isSystemTrayAvailable():
+            self.tray_icon = QSystemTrayIcon(self.windowIcon(), self)
+            self.tray_icon.show()
+        if self.tray_icon is not None:
+            self.tray_icon.showMessage("neuropacs", message, QSystemTrayIcon.Information, 10000)
+        QApplication.alert(self)
 
     def add_job_to_table(self, order_id, dataset_id, product, timestamp, qc, status):
-        row_count = self.jobs_table.rowCount()
-        self.jobs_table.insertRow(row_count)
-
-        # Create QTableWidgetItems for each column
-        timestamp_item = QTableWidgetItem(timestamp)
-        product_item = QTableWidgetItem(product)
-        order_id_item = QTableWidgetItem(order_id)
-        dataset_id_item = QTableWidgetItem(dataset_id)
-        qc_item = QTableWidgetItem()
-        status_item = QTableWidgetItem(status)
-
-        # Determine what image to use for QC row
-        if qc == "PASS":
-            icon_src = self.resource_path("resources/pass.png")
-        elif qc == "FAIL":
-            icon_src = self.resource_path("resources/fail.png")
-        elif qc == "IP":
-            icon_src = self.resource_path("resources/loading.png")
-        else:
-            icon_src = self.resource_path("resources/question.png")
-        
-        qc_icon = QIcon(icon_src)  # file path
-        qc_item.setIcon(qc_icon)
-
-        # Set text color for readability
-        text_color = QColor("#333333")
-        timestamp_item.setForeground(text_color)
-        product_item.setForeground(text_color)
-        order_id_item.setForeground(text_color)
-        dataset_id_item.setForeground(text_color)
-        status_item.setForeground(text_color)
-
-        # Create buttons for actions
-        check_button = QPushButton("Result")
-        delete_button = QPushButton("Delete")
-
-        # Connect buttons to their respective methods, passing only order_id
-        if qc != "FAIL" and qc != "IP":
-            check_button.clicked.connect(lambda _, oid=order_id: self.check_status(oid))
-        else:
-            check_button.setEnabled(False)
-        delete_button.clicked.connect(lambda _, oid=order_id: self.delete_job(oid))
-
-        # Create a widget to hold the buttons and set layout
-        actions_widget = QWidget()
-        actions_layout = QHBoxLayout(actions_widget)
-        actions_layout.setContentsMargins(0, 0, 0, 0)
-        actions_layout.setSpacing(5)
-        actions_layout.addWidget(check_button)
-        actions_layout.addWidget(delete_button)
-
-        # Populate the table with items and the actions widget
-        self.jobs_table.setItem(row_count, 0, timestamp_item)
-        self.jobs_table.setItem(row_count, 1, product_item)
-        self.jobs_table.setItem(row_count, 2, order_id_item)
-        self.jobs_table.setItem(row_count, 3, dataset_id_item)
-        self.jobs_table.setItem(row_count, 4, qc_item)
-        self.jobs_table.setItem(row_count, 5, status_item)
-        self.jobs_table.setCellWidget(row_count, 6, actions_widget)
-
-   
-    def make_table_non_editable(self):
-        for row in range(self.jobs_table.rowCount()):
-            for column in range(self.jobs_table.columnCount()):
-                item = self.jobs_table.item(row, column)
-                if item:
-                    item.setFlags(item.flags() & ~Qt.ItemIsEditable)
+        self.jobs_model.add_job({
+            "order_id": order_id,
+            "dataset_id": dataset_id,
+            "product": product,
+            "timestamp": timestamp,
+            "qc": qc,
+            "last_status": status,
+        })
 
     def open_website(self):
         url = "https://www.neuropacs.com"
         QDesktopServices.openUrl(QUrl(url))
 
     def check_status(self, order_id):
-        self.show_spinner("Checking job result...")
-        # Use QTimer to ensure the UI updates and spinner is visible
-        QTimer.singleShot(100, lambda: self.perform_status_check(order_id))
-
-    def perform_status_check(self, order_id):
-        # Iterate through rows to find the one matching the order_id
-        for row in range(self.jobs_table.rowCount()):
-            item = self.jobs_table.item(row, 2)  # Column 2 is "Order ID"
-            if item and item.text() == order_id:
-                try:
-                    # Check status using the SDK
-                    status = self.sdk_client.checkStatus(order_id)
-                    status_item = QTableWidgetItem(status)
-                    status_item.setForeground(QColor("#333333"))
-                    self.jobs_table.setItem(row, 5, status_item)  # Update status column
-                    self.statusbar.showMessage(f"Status of {order_id}: {status}", 5000)
-                    
-                    # Update the status in storage
-                    update_job_field(order_id, "last_status", status)
-
-                    self.hide_spinner()
-                    
-                    if status.lower() == "finished":
-                        self.get_results_dialog(order_id)   
-                except Exception as e:
-                    QMessageBox.warning(self, "Error", f"Failed to check status for {order_id}: {e}")
-                    self.hide_spinner()
-                return
-        # If order_id not found
-        QMessageBox.warning(self, "Error", f"Order ID '{order_id}' not found in the table.")
-        self.hide_spinner()
+        """Check the status of order_id in the background, offering its results once it finished."""
+        if self.jobs_model.job(order_id) is None:
+            QMessageBox.warning(self, "Error", f"Order ID '{order_id}' not found in the table.")
+            return
+        # Always fresh unless the job already finished/failed
+        job = get_job(order_id)
+        if job is not None:
+            self.sdk_client.prime_status(order_id, job["last_status"])
+        self.task_dispatcher.submit(
+            self.sdk_client.checkStatus, order_id, max_age=0,
+            key=("status", order_id), label=f"Checking status of {order_id}",
+            on_result=lambda status: self.on_status_checked(order_id, status),
+            on_error=lambda e: QMessageBox.warning(self, "Error", f"Failed to check status for {order_id}: {e}"),
+        )
 
+    def on_status_checked(self, order_id, status):
+        if get_job(order_id) is None:
+            return  # deleted meanwhile
+        self.patch_job(order_id, last_status=status)
+        self.status_poller.observe(order_id, status)
+        self.statusbar.showMessage(f"Status of {order_id}: {status}", 5000)
+        if status.lower() == "finished":
+            self.get_results_dialog(order_id)
 
     def delete_job(self, order_id):
-        self.show_spinner("Deleting job...")
-        # Use QTimer to ensure the UI updates and spinner is visible
-        QTimer.singleShot(100, lambda: self.perform_delete_job(order_id))
-
-    def perform_delete_job(self, order_id):
         reply = QMessageBox.question(
             self, "Confirm Delete", 
             f"Are you sure you want to delete job '{order_id}'?",
@@ -724,17 +825,12 @@ class MainWindow(QMainWindow):
         if reply == QMessageBox.Yes:
             try:
                 remove_job(order_id)
-                # Find the row and remove it
-                for row in range(self.jobs_table.rowCount()):
-                    item = self.jobs_table.item(row, 2)  # Column 2 is "Order ID"
-                    if item and item.text() == order_id:
-                        self.jobs_table.removeRow(row)
-                        self.statusbar.showMessage(f"Job '{order_id}' has been deleted.", 5000)
-                        break
+                self.jobs_model.remove_job(order_id)
+                self.qc_scheduler.remove(order_id)
+                self.status_poller.unwatch(order_id)
+                self.statusbar.showMessage(f"Job '{order_id}' has been deleted.", 5000)
             except Exception as e:
                 QMessageBox.warning(self, "Error", f"Failed to delete job '{order_id}': {e}")
-        self.hide_spinner()
-
 
     def get_results_dialog(self, order_id):
         dialog = QDialog(self)
@@ -764,9 +860,82 @@ class MainWindow(QMainWindow):
         dialog.exec_()
 
     def get_results(self, order_id, format_type):
-        results = self.sdk_client.getResults(order_id, format_type)
-        results_dialog = ResultsDialog(results, format_type, self)
-        results_dialog.exec_()
+        if format_type == "PNG":
+            ResultsImageDialog(order_id, self.sdk_client, self.task_dispatcher, self).exec_()
+            return
+        self.task_dispatcher.submit(
+            self.sdk_client.getResults, order_id, format_type,
+            key=("results", order_id, format_type), label=f"Fetching {format_type} results of {order_id}", timeout=300,
+            on_result=lambda results: ResultsDialog(results, format_type, self).exec_(),
+            on_error=lambda e: QMessageBox.warning(self, "Error", f"Failed to fetch results of {order_id}: {e}"),
+        )
+
+    def export_results(self):
+        """
+        Export the results of the selected finished jobs (of every finished job
+        shown, if none is selected) to a folder or zip archive, in the background.
+        """
+        selected = [index.data(JOB_ROLE) for index in self.jobs_view.selectionModel().selectedRows()]
+        jobs = [
+            job for job in (selected or self.jobs_model.jobs)
+            if str(job["last_status"]).lower() == "finished"
+        ]
+        if not jobs:
+            QMessageBox.information(self, "Export Results", "No finished jobs to export.")
+            return
+        dialog = ExportResultsDialog(len(jobs), self)
+        if dialog.exec_() != QDialog.Accepted:
+            return
+        formats, destination, skip_existing, workers = dialog.get_options()
+        exported = [(job["order_id"], job["dataset_id"]) for job in jobs]
+        key = ("export", destination, tuple(exported), tuple(formats), skip_existing, workers)
+        if self.task_dispatcher.find(key) is not None:
+            self.statusbar.showMessage("This export is already running.", 10000)
+            return
+        # Unparented: kept alive by the call's arguments for as long as the workers may report to it
+        progress = ExportProgress()
+        cancel_event = threading.Event()
+        started = datetime.now()
+        task = self.task_dispatcher.submit(
+            self.sdk_client.export_results, exported, formats, destination,
+            max_workers=workers, skip_existing=skip_existing, progress_callback=progress, cancel_event=cancel_event,
+            key=key, label=f"Exporting results of {len(jobs)} job(s)", timeout=None,
+            on_result=lambda summary: self.on_export_finished(destination, summary),
+            on_error=lambda e: QMessageBox.warning(self, "Error", f"Failed to export results: {e}"),
+        )
+        # Stops the export's workers; whatever was exported already is kept
+        task.cancelled.connect(cancel_event.set)
+        task.cancelled.connect(lambda: self.statusbar.showMessage("Results export cancelled.", 10000))
+        progress.progress.connect(
+            lambda done, total, bytes_written: self.on_export_progress(task, started, done, total, bytes_written)
+        )
+
+    def on_export_progress(self, task, started, done, total, bytes_written):
+        if task.is_finished():
+            return  # cancelled: the workers are only winding down
+        seconds = max((datetime.now() - started).total_seconds(), 0.001)
+        self.statusbar.showMessage(
+            f"Exporting results: {done}/{total} files, {format_bytes(bytes_written)} "
+            f"({format_bytes(bytes_written / seconds)}/s, {done / seconds:.1f} files/s)"
+        )
+
+    def on_export_finished(self, destination, summary):
+        message = (
+            f"Exported {summary['exported']} file(s) ({format_bytes(summary['bytes'])}) "
+            f"in {summary['seconds']:.0f} s to {destination}."
+        )
+        if summary["skipped"]:
+            message += f"\n{summary['skipped']} file(s) already exported were skipped."
+        if summary["failed"]:
+            message += f"\n{summary['failed']} file(s) failed."
+        if summary["cancelled"]:
+            message += f"\n{summary['cancelled']} file(s) were not exported (cancelled)."
+        message += f"\nSee {summary['manifest']} for details."
+        self.statusbar.showMessage(f"Exported {summary['exported']} results file(s) to {destination}", 10000)
+        if summary["failed"]:
+            QMessageBox.warning(self, "Export Results", message)
+        else:
+            QMessageBox.information(self, "Export Results", message)
 
     def set_new_api_key(self):
         reply = QMessageBox.question(
@@ -775,6 +944,8 @@ class MainWindow(QMainWindow):
             QMessageBox.Yes | QMessageBox.No, QMessageBox.No
         )
         if reply == QMessageBox.Yes:
+            # Statuses still being fetched belong to the old key's jobs
+            self.cancel_status_refresh()
             self.api_key_line.clear()
             self.stacked_widget.setCurrentWidget(self.api_page)
             self.statusbar.showMessage("Please enter a new API key.", 5000)
@@ -785,32 +956,33 @@ class MainWindow(QMainWindow):
             order_id = order_id.strip()
 
             # Check if the order_id already exists in the current jobs
-            existing_jobs = get_jobs()
-            if any(job["order_id"] == order_id for job in existing_jobs):
+            if get_job(order_id) is not None:
                 QMessageBox.warning(self, "Duplicate Order ID", f"Order ID '{order_id}' already exists.")
                 return
 
-            try:
-                self.show_spinner("Adding order...")
-                from datetime import datetime
-                timestamp = str(datetime.now())
-                status = self.sdk_client.checkStatus(order_id)
-                add_job(order_id, "Unknown", "Atypical/MSAp/PSP-v1.0", "NA", timestamp) 
-                self.add_job_to_table(order_id, "Unknown", "Atypical/MSAp/PSP-v1.0", timestamp, "NA", status)
-            except Exception as e:
-                QMessageBox.information(self, "Order tracking failed", f"Failed to add {order_id} to list.")
-                self.hide_spinner()
-                return
-            self.hide_spinner()
-            QMessageBox.information(self, "Add order", f"Adding {order_id} to list.")
-            if status.lower() == "done":
-                self.get_results_dialog(order_id.strip())
+            self.task_dispatcher.submit(
+                self.sdk_client.checkStatus, order_id,
+                key=("track", order_id), label=f"Adding order {order_id}",
+                on_result=lambda status: self.on_order_tracked(order_id, status),
+                on_error=lambda e: QMessageBox.information(self, "Order tracking failed", f"Failed to add {order_id} to list."),
+            )
+
+    def on_order_tracked(self, order_id, status):
+        if get_job(order_id) is not None:
+            return  # added meanwhile
+        timestamp = str(datetime.now())
+        add_job(order_id, "Unknown", "Atypical/MSAp/PSP-v1.0", "NA", timestamp) 
+        self.add_job_to_table(order_id, "Unknown", "Atypical/MSAp/PSP-v1.0", timestamp, "NA", status)
+        self.status_poller.watch(order_id, status)
+        QMessageBox.information(self, "Add order", f"Adding {order_id} to list.")
+        if status.lower() == "done":
+            self.get_results_dialog(order_id)
 
     def toggle_qc_feature(self, checked):
         self.qc_enabled = bool(checked)
-        # If turning QC off, stop any running QC timer
-        if not self.qc_enabled and hasattr(self, 'qc_timer') and self.qc_timer.isActive():
-            self.qc_timer.stop()
-            self.statusbar.showMessage("QC Check Disabled and pending QC timer stopped", 5000)
+        # If turning QC off, stop polling the pending QC checks (they resume at the next start)
+        if not self.qc_enabled and self.qc_scheduler.pending():
+            self.qc_scheduler.clear()
+            self.statusbar.showMessage("QC Check Disabled and pending QC checks stopped", 5000)
         else:
             self.statusbar.showMessage("QC Check Enabled", 5000)
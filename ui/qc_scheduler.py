@@ -0,0 +1,125 @@
+# qc_scheduler.py
+# QC polling of any number of orders after upload, on one shared tick off the UI thread.
+import time
+from datetime import datetime
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+# Seconds an order may spend in QC before it counts as failed
+QC_TIMEOUT = 300
+# Milliseconds between QC polls of the pending orders
+QC_POLL_INTERVAL_MS = 10000
+
+def poll_qc(sdk_client, order_ids, is_pending=None):
+    """
+    One round of QC checks of the pending orders, made concurrently, with the
+    jobs of the orders that passed started right away (still off the UI thread).
+    is_pending(order_id), if given, is asked again right before each job is
+    started, so orders removed during the round (deleted jobs, QC turned off)
+    are not run. A PASS is only returned for an order whose job was started.
+    Returns [(order_id, outcome, error, run_error)].
+    """
+    results = []
+    for order_id, (outcome, error) in zip(order_ids, sdk_client.qc_check_many(order_ids)):
+        run_error = None
+        if outcome == "PASS":
+            if is_pending is not None and not is_pending(order_id):
+                continue
+            try:
+                sdk_client.runJob(order_id)
+            except Exception as e:
+                run_error = e
+        results.append((order_id, outcome, error, run_error))
+    return results
+
+class QCScheduler(QObject):
+    """
+    Tracks the orders waiting for QC, each with its own deadline, and polls all
+    of them on one shared timer, through the TaskDispatcher. Only one poll round
+    runs at a time; orders added meanwhile are picked up by the next tick.
+    """
+    # order_id, "PASS", "FAIL" or "TIMEOUT", and the error of runJob if a passing job could not start
+    qc_finished = pyqtSignal(str, str, object)
+
+    def __init__(self, sdk_client, dispatcher, timeout=QC_TIMEOUT, interval_ms=QC_POLL_INTERVAL_MS, parent=None):
+        super().__init__(parent)
+        self.sdk_client = sdk_client
+        self.dispatcher = dispatcher
+        self.timeout = timeout
+        self._pending = {}  # order_id -> deadline (time.time())
+        self._task = None  # poll round in flight
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._tick)
+
+    def pending(self):
+        return list(self._pending)
+
+    def add(self, order_id, deadline=None):
+        """Start polling the QC of order_id until it passes, fails or deadline passes."""
+        self._pending[order_id] = deadline if deadline is not None else time.time() + self.timeout
+        if not self._timer.isActive():
+            self._timer.start()
+        # Check new orders at once rather than a tick later
+        self._tick()
+
+    def resume(self, jobs):
+        """
+        Resume polling the jobs stored with QC in progress, e.g. after a restart.
+        Their deadlines run from the time the job was created; each is checked
+        at least once before it can time out.
+        """
+        for job in jobs:
+            if job["qc"] != "IP" or job["order_id"] in self._pending:
+                continue
+            try:
+                deadline = datetime.fromisoformat(job["timestamp"]).timestamp() + self.timeout
+            except (TypeError, ValueError):
+                deadline = None
+            self.add(job["order_id"], deadline)
+
+    def remove(self, order_id):
+        self._pending.pop(order_id, None)
+
+    def clear(self):
+        """
+        Stop polling every pending order. Outcomes of a poll in flight are
+        dropped, except for the jobs it already started.
+        """
+        self._pending.clear()
+        self._timer.stop()
+
+    def _tick(self):
+        if not self._pending:
+            self._timer.stop()
+            return
+        if self._task is not None:
+            return
+        self._task = self.dispatcher.submit(
+            poll_qc, self.sdk_client, list(self._pending), self._pending.__contains__,
+            # No timeout: a round that "timed out" while still starting jobs would let the next tick start them again
+            key="qc_poll", label="Checking QC", timeout=None, visible=False, on_result=self._on_results,
+        )
+        self._task.finished.connect(self._on_poll_finished)
+
+    def _on_results(self, results):
+        now = time.time()
+        for order_id, outcome, error, run_error in results:
+            if order_id not in self._pending and outcome != "PASS":
+                # Removed (job deleted, QC turned off) while the round ran. A PASS is still
+                # reported: its job was started, and a job left with QC in progress would run again.
+                continue
+            if outcome is None:
+                if error is not None:
+                    print(f"QC check of {order_id} failed: {error}")
+                if now >= self._pending[order_id]:
+                    del self._pending[order_id]
+                    self.qc_finished.emit(order_id, "TIMEOUT", None)
+                continue
+            self._pending.pop(order_id, None)
+            self.qc_finished.emit(order_id, outcome, run_error)
+        if not self._pending:
+            self._timer.stop()
+
+    def _on_poll_finished(self):
+        # A round that failed or timed out is simply retried on the next tick
+        self._task = None
@@ -0,0 +1,222 @@
+# results_view.py
+# Viewer of image results: decoded off the UI thread, previewed downscaled with zoom/pan, thumbnails cached on disk.
+import os
+import shutil
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QDialogButtonBox, QFileDialog,
+    QGraphicsView, QGraphicsScene, QGraphicsPixmapItem, QMessageBox
+)
+from PyQt5.QtGui import QImage, QImageReader, QPixmap, QPainter
+from PyQt5.QtCore import Qt, pyqtSignal
+
+# Longest side, in pixels, of the preview decoded for display; full resolution is only decoded when zoomed in
+PREVIEW_SIZE = 1600
+# Longest side, in pixels, of the thumbnails cached on disk
+THUMBNAIL_SIZE = 256
+ZOOM_STEP = 1.25
+MAX_ZOOM = 16
+
+def read_image(path, max_side=None):
+    """
+    Decode the image file at path, downscaled so its longest side is at most
+    max_side. QImage (unlike QPixmap) may be used off the UI thread.
+    Returns (image, size of the full image).
+    """
+    reader = QImageReader(path)
+    size = reader.size()
+    if max_side and size.isValid() and max(size.width(), size.height()) > max_side:
+        reader.setScaledSize(size.scaled(max_side, max_side, Qt.KeepAspectRatio))
+    image = reader.read()
+    if image.isNull():
+        raise ValueError(f"Cannot decode the results image: {reader.errorString()}")
+    return image, size if size.isValid() else image.size()
+
+class ResultImage:
+    """An image result ready to show: its file in the results cache and a decoded preview."""
+    def __init__(self, order_id, path, preview, full_size):
+        self.order_id = order_id
+        self.path = path
+        self.preview = preview
+        self.full_size = full_size
+
+def load_result_image(sdk_client, order_id):
+    """
+    Worker side of opening image results: make sure they are in the results
+    cache, decode a preview from the cached file and store its thumbnail.
+    """
+    path = sdk_client.results_path(order_id, "PNG")
+    preview, full_size = read_image(path, PREVIEW_SIZE)
+    thumbnail_path = sdk_client.results_cache.thumbnail_path(order_id)
+    if not os.path.exists(thumbnail_path):
+        os.makedirs(os.path.dirname(thumbnail_path), exist_ok=True)
+        thumbnail = preview.scaled(THUMBNAIL_SIZE, THUMBNAIL_SIZE, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        tmp_path = thumbnail_path + ".tmp"
+        if thumbnail.save(tmp_path, "PNG"):
+            os.replace(tmp_path, thumbnail_path)
+    return ResultImage(order_id, path, preview, full_size)
+
+def save_result_image(sdk_client, order_id, path):
+    """
+    Copy the original PNG from the results cache to path, never decoded or
+    re-encoded. The cached file is looked up again (fetched if evicted since).
+    """
+    shutil.copyfile(sdk_client.results_path(order_id, "PNG"), path)
+
+class ImageView(QGraphicsView):
+    """
+    Zoomable (wheel, buttons) and pannable (drag) image view. Scene units are
+    pixels of the full image, whatever the resolution of the image shown, so a
+    sharper image can replace a preview without moving the view.
+    """
+    full_resolution_needed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setScene(QGraphicsScene(self))
+        self.item = QGraphicsPixmapItem()
+        self.item.setTransformationMode(Qt.SmoothTransformation)
+        self.scene().addItem(self.item)
+        self.setRenderHint(QPainter.SmoothPixmapTransform)
+        self.setDragMode(QGraphicsView.ScrollHandDrag)
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+        self.full_resolution = False
+        self._fitted = True
+
+    def set_image(self, image, full_size, full_resolution=False):
+        self.item.setPixmap(QPixmap.fromImage(image))
+        self.item.setScale(full_size.width() / image.width())
+        self.scene().setSceneRect(0, 0, full_size.width(), full_size.height())
+        self.full_resolution = full_resolution
+        if self._fitted:
+            self.fit()
+
+    def fit(self):
+        self.fitInView(self.scene().sceneRect(), Qt.KeepAspectRatio)
+        self._fitted = True
+
+    def zoom(self, factor):
+        factor = min(factor, MAX_ZOOM / self.transform().m11())
+        self.scale(factor, factor)
+        self._fitted = False
+        # Preview pixels are being magnified: time for the full image
+        if not self.full_resolution and self.transform().m11() * self.item.scale() > 1:
+            self.full_resolution_needed.emit()
+
+    def actual_size(self):
+        self.resetTransform()
+        self._fitted = False
+        if not self.full_resolution and self.item.scale() > 1:
+            self.full_resolution_needed.emit()
+
+    def wheelEvent(self, event):
+        self.zoom(ZOOM_STEP if event.angleDelta().y() > 0 else 1 / ZOOM_STEP)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self._fitted:
+            self.fit()
+
+class ResultsImageDialog(QDialog):
+    """
+    Shows the image results of an order. The cached thumbnail, if any, shows
+    at once; the preview is fetched and decoded through the task dispatcher,
+    and the full image only once the user zooms past the preview's resolution.
+    """
+    def __init__(self, order_id, sdk_client, dispatcher, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Results")
+        self.resize(900, 700)
+        self.order_id = order_id
+        self.sdk_client = sdk_client
+        self.dispatcher = dispatcher
+        self.result = None
+        self._tasks = []
+        self._full_resolution_requested = False
+        layout = QVBoxLayout(self)
+
+        self.view = ImageView()
+        self.view.full_resolution_needed.connect(self.load_full_resolution)
+        layout.addWidget(self.view)
+
+        controls = QHBoxLayout()
+        for text, slot in (
+            ("Zoom In", lambda: self.view.zoom(ZOOM_STEP)),
+            ("Zoom Out", lambda: self.view.zoom(1 / ZOOM_STEP)),
+            ("Fit", self.view.fit),
+            ("100%", self.view.actual_size),
+        ):
+            button = QPushButton(text)
+            button.clicked.connect(slot)
+            controls.addWidget(button)
+        self.info_label = QLabel("Loading...")
+        controls.addWidget(self.info_label, 1)
+        layout.addLayout(controls)
+
+        button_box = QDialogButtonBox(QDialogButtonBox.Save | QDialogButtonBox.Close)
+        self.save_button = button_box.button(QDialogButtonBox.Save)
+        self.save_button.setEnabled(False)
+        button_box.accepted.connect(self.save_results)
+        button_box.rejected.connect(self.close)
+        layout.addWidget(button_box)
+
+        thumbnail_path = sdk_client.results_cache.thumbnail_path(order_id)
+        if os.path.exists(thumbnail_path):
+            thumbnail = QImage(thumbnail_path)
+            if not thumbnail.isNull():
+                self.view.set_image(thumbnail, thumbnail.size())
+        self._submit(
+            load_result_image, sdk_client, order_id,
+            key=("result_image", order_id), label=f"Loading results of {order_id}", timeout=300,
+            on_result=self.on_loaded, on_error=self.on_failed,
+        )
+
+    def _submit(self, fn, *args, **kwargs):
+        self._tasks.append(self.dispatcher.submit(fn, *args, **kwargs))
+
+    def on_loaded(self, result):
+        self.result = result
+        full = result.preview.size() == result.full_size
+        self.view.set_image(result.preview, result.full_size, full_resolution=full)
+        self.info_label.setText(f"{result.full_size.width()} x {result.full_size.height()}")
+        self.save_button.setEnabled(True)
+
+    def on_failed(self, error):
+        self.info_label.setText("Failed to load the results.")
+        QMessageBox.warning(self, "Error", f"Failed to load results of {self.order_id}: {error}")
+
+    def load_full_resolution(self):
+        if self.result is None or self.view.full_resolution or self._full_resolution_requested:
+            return
+        self._full_resolution_requested = True
+        self.info_label.setText("Loading full resolution...")
+        self._submit(
+            read_image, self.result.path,
+            key=("full_image", self.result.path), label=f"Decoding results of {self.order_id}",
+            on_result=self.on_full_resolution, on_error=self.on_full_resolution_failed,
+        )
+
+    def on_full_resolution(self, decoded):
+        image, full_size = decoded
+        self.view.set_image(image, full_size, full_resolution=True)
+        self.info_label.setText(f"{full_size.width()} x {full_size.height()} (full resolution)")
+
+    def on_full_resolution_failed(self, error):
+        # Zooming in again retries
+        self._full_resolution_requested = False
+        self.info_label.setText(f"Failed to load full resolution: {error}")
+
+    def save_results(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Save Results", f"{self.order_id}.png", "PNG Image (*.png)")
+        if path:
+            # Not one of the dialog's tasks: closing the dialog must not cancel a save
+            self.dispatcher.submit(
+                save_result_image, self.sdk_client, self.order_id, path,
+                key=("save_image", self.order_id, path), label=f"Saving results of {self.order_id}", timeout=300,
+                on_error=lambda e: QMessageBox.warning(self, "Error", f"Failed to save results: {e}"),
+            )
+
+    def done(self, result):
+        # Nothing left to show the results in
+        for task in self._tasks:
+            task.cancel()
+        super().done(result)
@@ -0,0 +1,177 @@
+# status_poller.py
+# Background polling of running jobs, with per-job adaptive intervals and a global request budget.
+import re
+import time
+from collections import deque
+from storage import is_terminal_status
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+# Seconds between polls of a job just started, or about to finish
+MIN_INTERVAL = 15
+# Seconds between polls of a job whose status has not changed for a long time
+MAX_INTERVAL = 600
+# Factor the interval grows by each time a poll finds the status unchanged
+BACKOFF = 2
+# Status checks allowed per minute, across all jobs
+MAX_REQUESTS_PER_MINUTE = 30
+# Milliseconds between checks for jobs that are due
+TICK_MS = 1000
+
+_PROGRESS_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*%")
+
+def parse_progress(status):
+    """The percentage of a status like "45% - Processing", or None."""
+    match = _PROGRESS_RE.match(status or "")
+    return float(match.group(1)) if match else None
+
+class PolledJob:
+    """Polling state of one watched job."""
+    def __init__(self, order_id, status, due, interval):
+        self.order_id = order_id
+        self.status = status
+        self.due = due            # time.monotonic() of the next poll
+        self.interval = interval  # seconds
+        self.progress = parse_progress(status)
+        self.progress_time = time.monotonic() if self.progress is not None else None
+
+    def observe(self, status, now):
+        """
+        Take a polled status into account and schedule the next poll:
+        unchanged statuses back off, progress that moves is polled at about a
+        quarter of its estimated time to completion, other changes reset to fast.
+        """
+        progress = parse_progress(status)
+        if status == self.status:
+            self.interval = min(self.interval * BACKOFF, MAX_INTERVAL)
+        elif progress is not None and self.progress is not None and progress > self.progress:
+            rate = (progress - self.progress) / max(now - self.progress_time, 1e-3)
+            self.interval = min(max((100 - progress) / rate / 4, MIN_INTERVAL), MAX_INTERVAL)
+        else:
+            self.interval = MIN_INTERVAL
+        if progress is not None and progress != self.progress:
+            self.progress, self.progress_time = progress, now
+        self.status = status
+        self.due = now + self.interval
+
+def poll_statuses(sdk_client, order_ids):
+    """One round of fresh status checks, made concurrently. Returns [(order_id, status, error)]."""
+    # No retries: the next poll of a job is its retry, and counts against the budget
+    results = sdk_client.check_status_many(order_ids, retries=0, max_age=0)
+    return [(order_id, status, error) for order_id, (status, error) in zip(order_ids, results)]
+
+class StatusPoller(QObject):
+    """
+    Watches the running jobs and polls each when it is due, on one shared tick,
+    through the TaskDispatcher.
+    Polls are spent most overdue first within max_per_minute requests over any
+    minute; jobs that do not fit wait for the next tick. Only jobs whose status
+    changed are signalled, and jobs are dropped once their status is terminal.
+    """
+    status_changed = pyqtSignal(str, str)  # order_id, status
+    job_finished = pyqtSignal(str, str)    # order_id, terminal status
+
+    def __init__(self, sdk_client, dispatcher, max_per_minute=MAX_REQUESTS_PER_MINUTE, parent=None):
+        super().__init__(parent)
+        self.sdk_client = sdk_client
+        self.dispatcher = dispatcher
+        self.max_per_minute = max_per_minute
+        self._jobs = {}           # order_id -> PolledJob
+        self._requests = deque()  # time.monotonic() of the polls of the last minute
+        self._task = None  # poll round in flight
+        self._timer = QTimer(self)
+        self._timer.setInterval(TICK_MS)
+        self._timer.timeout.connect(self._tick)
+
+    def watched(self):
+        return list(self._jobs)
+
+    def watch(self, order_id, status=None, just_started=False):
+        """
+        Poll order_id until its status is terminal. A job just started is polled
+        soon; otherwise the first poll is spread over the minimum interval, so
+        watching many jobs at once does not poll them all in the same tick.
+        """
+        if is_terminal_status(status):
+            return
+        now = time.monotonic()
+        if just_started:
+            due = now + MIN_INTERVAL
+        else:
+            due = now + MIN_INTERVAL * (1 + len(self._jobs) % 4)
+        self._jobs[order_id] = PolledJob(order_id, status, due, MIN_INTERVAL)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def watch_jobs(self, jobs):
+        """Watch every stored job that is still running (not terminal, not waiting for or failed at QC)."""
+        for job in jobs:
+            if job["qc"] not in ("FAIL", "IP") and job["order_id"] not in self._jobs:
+                self.watch(job["order_id"], job["last_status"])
+
+    def observe(self, order_id, status):
+        """Record a status checked elsewhere (e.g. by the user), which reschedules the job."""
+        job = self._jobs.get(order_id)
+        if job is None:
+            return
+        if is_terminal_status(status):
+            self.unwatch(order_id)
+        else:
+            job.observe(status, time.monotonic())
+
+    def unwatch(self, order_id):
+        self._jobs.pop(order_id, None)
+
+    def stop(self):
+        self._jobs.clear()
+        self._timer.stop()
+
+    def _budget(self, now):
+        while self._requests and now - self._requests[0] >= 60:
+            self._requests.popleft()
+        return self.max_per_minute - len(self._requests)
+
+    def _tick(self):
+        if not self._jobs:
+            self._timer.stop()
+            return
+        if self._task is not None:
+            return
+        now = time.monotonic()
+        budget = self._budget(now)
+        if budget <= 0:
+            return
+        due = sorted((job for job in self._jobs.values() if job.due <= now), key=lambda job: job.due)[:budget]
+        if not due:
+            return
+        self._requests.extend([now] * len(due))
+        self._task = self.dispatcher.submit(
+            poll_statuses, self.sdk_client, [job.order_id for job in due],
+            key="status_poll", label="Polling job statuses", visible=False, on_result=self._on_results,
+        )
+        self._task.finished.connect(self._on_poll_finished)
+
+    def _on_results(self, results):
+        now = time.monotonic()
+        for order_id, status, error in results:
+            job = self._jobs.get(order_id)
+            if job is None:
+                continue
+            if error is not None:
+                if "API key incompatible." in str(error):
+                    self.unwatch(order_id)
+                else:
+                    # Back off as if nothing changed
+                    job.observe(job.status, now)
+                continue
+            changed = status != job.status
+            if is_terminal_status(status):
+                self.unwatch(order_id)
+            else:
+                job.observe(status, now)
+            if changed:
+                self.status_changed.emit(order_id, status)
+                if is_terminal_status(status):
+                    self.job_finished.emit(order_id, status)
+
+    def _on_poll_finished(self):
+        self._task = None
@@ -0,0 +1,233 @@
+# task_dispatcher.py
+# Runs SDK calls on a thread pool for the UI, with cancellation, timeouts, de-duplication and a visible queue.
+import threading
+from PyQt5.QtWidgets import QWidget, QHBoxLayout, QLabel, QToolButton, QMenu
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+# Seconds a task may run before it fails with TaskTimeout, unless submitted with its own timeout
+DEFAULT_TIMEOUT = 60
+# Seconds shutdown() waits for running calls to return before the app exits anyway
+SHUTDOWN_WAIT = 5
+
+class TaskTimeout(TimeoutError):
+    pass
+
+class Task(QObject):
+    """
+    A call submitted to the TaskDispatcher. Exactly one of succeeded, failed or
+    cancelled is emitted, on the UI thread, followed by finished.
+    """
+    QUEUED = "Queued"
+    RUNNING = "Running"
+    DONE = "Done"
+    FAILED = "Failed"
+    CANCELLED = "Cancelled"
+
+    succeeded = pyqtSignal(object)  # the return value of the call
+    failed = pyqtSignal(object)     # the exception it raised, or TaskTimeout
+    cancelled = pyqtSignal()
+    finished = pyqtSignal()
+
+    def __init__(self, dispatcher, key, label, visible, timeout):
+        super().__init__()
+        self.dispatcher = dispatcher
+        self.key = key
+        self.label = label
+        self.visible = visible
+        self.timeout = timeout
+        self.state = Task.QUEUED
+        # Set when the task is cancelled or times out; long calls may poll it to stop early
+        self.cancel_event = threading.Event()
+        self._runnable = None
+        self._timer = None
+
+    def is_finished(self):
+        return self.state in (Task.DONE, Task.FAILED, Task.CANCELLED)
+
+    def cancel(self):
+        self.dispatcher.cancel(self)
+
+class _TaskRunnable(QRunnable):
+    def __init__(self, task, fn, args, kwargs):
+        super().__init__()
+        self.setAutoDelete(False)  # kept by the task, so that a queued run can be taken back
+        self.task = task
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        if self.task.cancel_event.is_set():
+            return
+        self._report("_task_started", self.task)
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self._report("_task_done", self.task, None, e)
+        else:
+            self._report("_task_done", self.task, result, None)
+
+    def _report(self, signal, *args):
+        # After shutdown() the dispatcher may already be deleted, with only its Python attributes left
+        dispatcher = self.task.dispatcher
+        with dispatcher._shutdown_lock:
+            if not dispatcher._shut_down:
+                getattr(dispatcher, signal).emit(*args)
+
+class TaskDispatcher(QObject):
+    """
+    The one way the window calls the network: submit() runs a call on a
+    QThreadPool and reports its outcome through the Task's signals.
+    A call submitted with the key of a task still in flight is not run again:
+    submit() returns that task, whose callbacks are those of the first
+    submit. Python threads cannot be interrupted, so a
+    cancelled or timed-out call that is already running finishes in the
+    background and its result is dropped.
+    """
+    queue_changed = pyqtSignal()
+    _task_started = pyqtSignal(object)
+    _task_done = pyqtSignal(object, object, object)  # task, result, error
+
+    def __init__(self, max_threads=4, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._tasks = []   # unfinished tasks, in submission order
+        self._by_key = {}  # key -> unfinished task
+        self._shutdown_lock = threading.Lock()
+        self._shut_down = False
+        self._task_started.connect(self._on_started)
+        self._task_done.connect(self._on_done)
+
+    def submit(self, fn, *args, key=None, label="", timeout=DEFAULT_TIMEOUT, visible=True,
+               on_result=None, on_error=None, **kwargs):
+        """
+        Run fn(*args, **kwargs) on the pool and return its Task. on_result and
+        on_error are connected to the task's succeeded and failed signals.
+        If a task with the same key is still in flight, it is returned instead
+        and on_result/on_error are not connected, so the outcome is handled once.
+        The timeout counts from when the call starts running, not while it is queued.
+        Tasks with visible=False (background polling) are left out of the queue shown to the user.
+        """
+        task = self.find(key)
+        if task is not None:
+            return task
+        task = Task(self, key, label, visible, timeout)
+        self._tasks.append(task)
+        if key is not None:
+            self._by_key[key] = task
+        if on_result is not None:
+            task.succeeded.connect(on_result)
+        if on_error is not None:
+            task.failed.connect(on_error)
+        task._runnable = _TaskRunnable(task, fn, args, kwargs)
+        self.pool.start(task._runnable)
+        self.queue_changed.emit()
+        return task
+
+    def find(self, key):
+        """Return the unfinished task submitted with key, or None."""
+        return self._by_key.get(key) if key is not None else None
+
+    def tasks(self, visible_only=True):
+        return [task for task in self._tasks if task.visible or not visible_only]
+
+    def cancel(self, task):
+        if task.is_finished():
+            return
+        task.cancel_event.set()
+        self.pool.tryTake(task._runnable)
+        self._finish(task, Task.CANCELLED)
+
+    def cancel_all(self, visible_only=True):
+        for task in self.tasks(visible_only):
+            self.cancel(task)
+
+    def shutdown(self):
+        """
+        Cancel every task and stop reporting outcomes, then give the running
+        calls up to SHUTDOWN_WAIT seconds to return. Called when the app quits.
+        """
+        self.cancel_all(visible_only=False)
+        with self._shutdown_lock:
+            self._shut_down = True
+        self.pool.clear()
+        self.pool.waitForDone(int(SHUTDOWN_WAIT * 1000))
+
+    def _on_started(self, task):
+        if task.state != Task.QUEUED:
+            return
+        task.state = Task.RUNNING
+        if task.timeout:
+            task._timer = QTimer(self)
+            task._timer.setSingleShot(True)
+            task._timer.timeout.connect(lambda: self._on_timeout(task))
+            task._timer.start(int(task.timeout * 1000))
+        self.queue_changed.emit()
+
+    def _on_done(self, task, result, error):
+        # A task that was cancelled or timed out already reported its outcome
+        if task.is_finished():
+            return
+        if error is None:
+            self._finish(task, Task.DONE, result=result)
+        else:
+            self._finish(task, Task.FAILED, error=error)
+
+    def _on_timeout(self, task):
+        if task.is_finished():
+            return
+        task.cancel_event.set()
+        self.pool.tryTake(task._runnable)
+        self._finish(task, Task.FAILED, error=TaskTimeout(f"{task.label or 'Task'} timed out after {task.timeout:g} s"))
+
+    def _finish(self, task, state, result=None, error=None):
+        task.state = state
+        if task._timer is not None:
+            task._timer.stop()
+            task._timer.deleteLater()
+            task._timer = None
+        self._tasks.remove(task)
+        if task.key is not None and self._by_key.get(task.key) is task:
+            del self._by_key[task.key]
+        if state == Task.DONE:
+            task.succeeded.emit(result)
+        elif state == Task.FAILED:
+            task.failed.emit(error)
+        else:
+            task.cancelled.emit()
+        task.finished.emit()
+        self.queue_changed.emit()
+
+class TaskQueueWidget(QWidget):
+    """Status bar view of the visible tasks, with a menu to cancel them."""
+    def __init__(self, dispatcher, parent=None):
+        super().__init__(parent)
+        self.dispatcher = dispatcher
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.label = QLabel()
+        self.cancel_button = QToolButton()
+        self.cancel_button.setText("Cancel")
+        self.cancel_button.setPopupMode(QToolButton.InstantPopup)
+        self.menu = QMenu(self)
+        self.cancel_button.setMenu(self.menu)
+        layout.addWidget(self.label)
+        layout.addWidget(self.cancel_button)
+        dispatcher.queue_changed.connect(self.refresh)
+        self.refresh()
+
+    def refresh(self):
+        tasks = self.dispatcher.tasks()
+        self.setVisible(bool(tasks))
+        self.menu.clear()
+        if not tasks:
+            return
+        running = sum(1 for task in tasks if task.state == Task.RUNNING)
+        self.label.setText(f"{tasks[0].label}" + (f" (+{len(tasks) - 1} more, {running} running)" if len(tasks) > 1 else ""))
+        self.label.setToolTip("\n".join(f"{task.state}: {task.label}" for task in tasks))
+        for task in tasks:
+            self.menu.addAction(task.label, task.cancel)
+        if len(tasks) > 1:
+            self.menu.addSeparator()
+            self.menu.addAction("Cancel all", self.dispatcher.cancel_all)
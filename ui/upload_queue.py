@@ -0,0 +1,425 @@
+# upload_queue.py
+# Queue of dataset uploads, run with bounded parallelism off the UI thread.
+import os
+import threading
+import time
+from datetime import datetime
+from dicom_scan import scan_dataset
+from storage import get_upload, get_resumable_uploads, remove_upload, add_fingerprint, find_fingerprint
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget,
+    QTableWidgetItem, QProgressBar, QSpinBox, QAbstractItemView
+)
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+
+def format_bytes(num_bytes):
+    """Format a byte count for display, e.g. 1536 -> '1.5 KB'."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if num_bytes < 1024 or unit == "GB":
+            return f"{num_bytes:.0f} {unit}" if unit == "B" else f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+
+class UploadCancelled(Exception):
+    pass
+
+class UploadWorker(QThread):
+    progress_signal = pyqtSignal(object, object)  # bytes sent, bytes total
+    order_created_signal = pyqtSignal(str)
+    size_signal = pyqtSignal(object)  # total bytes of the DICOM files to upload
+    failed_signal = pyqtSignal(str)
+    status_signal = pyqtSignal(str)  # what was found in the dataset, or that the upload is resuming
+    duplicate_signal = pyqtSignal(object)  # earlier uploads of the same dataset, from find_fingerprint
+
+    def __init__(self, sdk_client, order_id, dataset_path):
+        """
+        The dataset is scanned first, so that only its DICOM instances are uploaded
+        and a directory without any fails before a job is created. If order_id is
+        None a new job is created on the worker thread after the scan; otherwise
+        the upload of that order is resumed.
+        If the dataset was uploaded before, duplicate_signal is emitted and the worker
+        waits for resolve_duplicate() before creating a job.
+        """
+        super().__init__()
+        self.sdk_client = sdk_client
+        self.order_id = order_id
+        self.dataset_path = dataset_path
+        self._resume_event = threading.Event()
+        self._resume_event.set()
+        self._cancelled = False
+        self._decision_event = threading.Event()
+        self.reused = False
+
+    def resolve_duplicate(self, order_id):
+        """Reuse the earlier order_id instead of uploading, or upload anyway if order_id is None."""
+        if order_id is not None:
+            self.order_id = order_id
+            self.reused = True
+        self._decision_event.set()
+
+    def pause(self):
+        self._resume_event.clear()
+
+    def resume(self):
+        self._resume_event.set()
+
+    def cancel(self):
+        self._cancelled = True
+        self._resume_event.set()
+        self._decision_event.set()
+
+    def _checkpoint(self):
+        """Block while paused; abort the upload if it was cancelled."""
+        self._resume_event.wait()
+        if self._cancelled:
+            raise UploadCancelled("Upload cancelled")
+
+    def run(self):
+        def progress_callback(bytes_done, bytes_total):
+            self.progress_signal.emit(bytes_done, bytes_total)
+        try:
+            upload = get_upload(self.order_id) if self.order_id is not None else None
+            # Header scans are cached, so this is cheap when resuming
+            scanned = scan_dataset(self.dataset_path)
+            fingerprint = scanned.fingerprint() if scanned.files else None
+            if upload is None:
+                manifest = scanned
+                if not manifest.files:
+                    raise ValueError("No DICOM files found in the selected directory.")
+                self.status_signal.emit(manifest.summary())
+                self.size_signal.emit(manifest.total_bytes)
+            else:
+                # Resuming: the manifest recorded when the upload started is used
+                manifest = None
+                self.size_signal.emit(sum(file["size"] for file in upload["files"]))
+            self._checkpoint()
+            if self.order_id is None:
+                matches = find_fingerprint(fingerprint)
+                if matches:
+                    self.duplicate_signal.emit(matches)
+                    self._decision_event.wait()
+                    self._checkpoint()
+                    if self.reused:
+                        return
+                self.order_id = self.sdk_client.newJob()
+                self.order_created_signal.emit(self.order_id)
+            self._checkpoint()
+            self.sdk_client.upload(
+                self.order_id, self.dataset_path, progress_callback, manifest=manifest, checkpoint=self._checkpoint,
+                status_callback=self.status_signal.emit,
+            )
+            if fingerprint is not None:
+                add_fingerprint(fingerprint, self.order_id, self.dataset_path, str(datetime.now()))
+        except Exception as e:
+            self.failed_signal.emit(str(e))
+
+class UploadTask:
+    """One dataset in the upload queue."""
+    QUEUED = "Queued"
+    UPLOADING = "Uploading"
+    PAUSED = "Paused"
+    DONE = "Done"
+    FAILED = "Failed"
+    CANCELLED = "Cancelled"
+    REUSED = "Reused"  # the dataset was uploaded before and the earlier order is used instead
+
+    def __init__(self, dataset_path):
+        self.dataset_path = dataset_path
+        self.dataset_id = os.path.basename(dataset_path.rstrip("/\\"))
+        self.order_id = None
+        self.state = UploadTask.QUEUED
+        self.progress = 0
+        self.bytes_total = 0
+        self.bytes_done = 0
+        self.bytes_per_sec = 0.0
+        self.error = None
+        self.info = ""  # latest status message of the upload, shown as a tooltip
+        self.worker = None
+        self._last_sample = None  # (time, bytes_done) of the previous progress update
+
+    def is_finished(self):
+        return self.state in (UploadTask.DONE, UploadTask.FAILED, UploadTask.CANCELLED, UploadTask.REUSED)
+
+class UploadQueue(QObject):
+    """
+    Runs queued dataset uploads, at most max_concurrent at a time, in queue order.
+    Job creation (newJob) and the upload itself both happen on UploadWorker threads.
+    """
+    task_updated = pyqtSignal(object)   # UploadTask whose state or progress changed
+    task_finished = pyqtSignal(object)  # UploadTask that is Done, Failed, Cancelled or Reused
+    duplicate_found = pyqtSignal(object, object)  # UploadTask, earlier uploads of its dataset; answer with resolve_duplicate()
+    queue_changed = pyqtSignal()        # tasks were added, removed or reordered
+
+    def __init__(self, sdk_client, max_concurrent=2, parent=None):
+        super().__init__(parent)
+        self.sdk_client = sdk_client
+        self.max_concurrent = max_concurrent
+        self.tasks = []
+        self.load_resumable()
+
+    def load_resumable(self):
+        """
+        Add the uploads interrupted in a previous session as paused tasks,
+        so the user can resume (or cancel) them.
+        """
+        known = {task.order_id for task in self.tasks}
+        for upload in get_resumable_uploads():
+            if upload["order_id"] in known:
+                continue
+            task = UploadTask(upload["dataset_path"])
+            task.order_id = upload["order_id"]
+            task.state = UploadTask.PAUSED
+            task.bytes_total = upload["bytes_total"]
+            task.bytes_done = upload["bytes_done"]
+            task.progress = int(upload["files_done"] * 100 / upload["files_total"]) if upload["files_total"] else 0
+            self.tasks.append(task)
+        self.queue_changed.emit()
+
+    def add(self, dataset_paths):
+        for dataset_path in dataset_paths:
+            self.tasks.append(UploadTask(dataset_path))
+        self.queue_changed.emit()
+        self._start_next()
+
+    def set_max_concurrent(self, max_concurrent):
+        self.max_concurrent = max(1, max_concurrent)
+        self._start_next()
+
+    def active_tasks(self):
+        """Tasks holding an upload slot (uploading or paused mid-upload)."""
+        return [task for task in self.tasks if task.worker is not None]
+
+    def pending_tasks(self):
+        return [task for task in self.tasks if not task.is_finished()]
+
+    def pause(self, task):
+        if task.state == UploadTask.UPLOADING:
+            task.worker.pause()
+        elif task.state != UploadTask.QUEUED:
+            return
+        task.state = UploadTask.PAUSED
+        task.bytes_per_sec = 0.0
+        self.task_updated.emit(task)
+
+    def resume(self, task):
+        """Resume a paused task, or retry a failed one (continuing its upload where it stopped)."""
+        if task.state == UploadTask.FAILED and task.order_id is not None:
+            task.state = UploadTask.PAUSED
+            task.error = None
+        if task.state != UploadTask.PAUSED:
+            return
+        if task.worker is not None:
+            task.worker.resume()
+            task.state = UploadTask.UPLOADING
+            task._last_sample = None
+        else:
+            task.state = UploadTask.QUEUED
+        self.task_updated.emit(task)
+        self._start_next()
+
+    def cancel(self, task):
+        if task.is_finished():
+            return
+        if task.worker is not None:
+            # The worker stops at its next file and reports back through failed_signal
+            task.worker.cancel()
+            return
+        self._mark_cancelled(task)
+
+    def _mark_cancelled(self, task):
+        task.state = UploadTask.CANCELLED
+        if task.order_id is not None:
+            # A cancelled upload is abandoned, not resumable
+            remove_upload(task.order_id)
+        self.task_updated.emit(task)
+        self.task_finished.emit(task)
+
+    def resolve_duplicate(self, task, order_id):
+        """Answer duplicate_found: reuse the earlier order_id, or upload anyway if order_id is None."""
+        if task.worker is not None:
+            task.worker.resolve_duplicate(order_id)
+
+    def move(self, task, offset):
+        """Move a task up (negative offset) or down the queue."""
+        index = self.tasks.index(task)
+        new_index = min(max(index + offset, 0), len(self.tasks) - 1)
+        if new_index != index:
+            self.tasks.insert(new_index, self.tasks.pop(index))
+            self.queue_changed.emit()
+
+    def clear_finished(self):
+        self.tasks = [task for task in self.tasks if not task.is_finished()]
+        self.queue_changed.emit()
+
+    def aggregate(self):
+        """Return (percent done, bytes/sec) across all unfinished tasks."""
+        tasks = [task for task in self.tasks if not task.is_finished()]
+        total = sum(task.bytes_total for task in tasks)
+        done = sum(task.bytes_done for task in tasks)
+        percent = int(done * 100 / total) if total else 0
+        return percent, sum(task.bytes_per_sec for task in tasks)
+
+    def _start_next(self):
+        while len(self.active_tasks()) < self.max_concurrent:
+            task = next((task for task in self.tasks if task.state == UploadTask.QUEUED), None)
+            if task is None:
+                return
+            self._start(task)
+
+    def _start(self, task):
+        task.state = UploadTask.UPLOADING
+        task.worker = UploadWorker(self.sdk_client, task.order_id, task.dataset_path)
+        task.worker.size_signal.connect(lambda size, t=task: self._on_size(t, size))
+        task.worker.order_created_signal.connect(lambda order_id, t=task: self._on_order_created(t, order_id))
+        task.worker.progress_signal.connect(lambda done, total, t=task: self._on_progress(t, done, total))
+        task.worker.failed_signal.connect(lambda error, t=task: setattr(t, "error", error))
+        task.worker.status_signal.connect(lambda message, t=task: self._on_status(t, message))
+        task.worker.duplicate_signal.connect(lambda matches, t=task: self.duplicate_found.emit(t, matches))
+        task.worker.finished.connect(lambda t=task: self._on_worker_finished(t))
+        task.worker.start()
+        self.task_updated.emit(task)
+
+    def _on_size(self, task, size):
+        task.bytes_total = size
+        self.task_updated.emit(task)
+
+    def _on_status(self, task, message):
+        task.info = message
+        self.task_updated.emit(task)
+
+    def _on_order_created(self, task, order_id):
+        task.order_id = order_id
+        self.task_updated.emit(task)
+
+    def _on_progress(self, task, bytes_done, bytes_total):
+        now = time.monotonic()
+        task.bytes_done = bytes_done
+        task.bytes_total = bytes_total
+        task.progress = int(bytes_done * 100 / bytes_total) if bytes_total else 100
+        if task._last_sample is not None:
+            last_time, last_bytes = task._last_sample
+            if now > last_time:
+                # Exponentially smoothed upload speed
+                rate = (task.bytes_done - last_bytes) / (now - last_time)
+                task.bytes_per_sec = rate if task.bytes_per_sec == 0 else 0.7 * task.bytes_per_sec + 0.3 * rate
+        task._last_sample = (now, task.bytes_done)
+        self.task_updated.emit(task)
+
+    def _on_worker_finished(self, task):
+        worker = task.worker
+        task.worker = None
+        task.bytes_per_sec = 0.0
+        worker.deleteLater()
+        if worker._cancelled:
+            self._mark_cancelled(task)
+        elif worker.reused:
+            task.order_id = worker.order_id
+            task.state = UploadTask.REUSED
+            task.progress = 100
+            self.task_updated.emit(task)
+            self.task_finished.emit(task)
+        else:
+            if task.error is not None or task.progress < 100:
+                task.state = UploadTask.FAILED
+            else:
+                task.state = UploadTask.DONE
+            self.task_updated.emit(task)
+            self.task_finished.emit(task)
+        self._start_next()
+
+class UploadQueueWidget(QWidget):
+    """Table of queued uploads with pause/resume, cancel and reorder controls."""
+    COLUMNS = ["Dataset", "Order ID", "Status", "Progress", "Speed"]
+
+    def __init__(self, upload_queue, parent=None):
+        super().__init__(parent)
+        self.upload_queue = upload_queue
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setColumnWidth(0, 160)
+        self.table.setColumnWidth(1, 120)
+        self.table.setColumnWidth(2, 80)
+        self.table.setColumnWidth(3, 160)
+        self.table.setMaximumHeight(150)
+        layout.addWidget(self.table)
+
+        controls = QHBoxLayout()
+        self.pause_button = QPushButton("Pause")
+        self.pause_button.clicked.connect(lambda: self._with_selected(self.upload_queue.pause))
+        self.resume_button = QPushButton("Resume/Retry")
+        self.resume_button.clicked.connect(lambda: self._with_selected(self.upload_queue.resume))
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(lambda: self._with_selected(self.upload_queue.cancel))
+        self.up_button = QPushButton("Move Up")
+        self.up_button.clicked.connect(lambda: self._with_selected(lambda task: self.upload_queue.move(task, -1)))
+        self.down_button = QPushButton("Move Down")
+        self.down_button.clicked.connect(lambda: self._with_selected(lambda task: self.upload_queue.move(task, 1)))
+        self.clear_button = QPushButton("Clear Finished")
+        self.clear_button.clicked.connect(self.upload_queue.clear_finished)
+
+        self.concurrency_spinbox = QSpinBox()
+        self.concurrency_spinbox.setRange(1, 8)
+        self.concurrency_spinbox.setValue(self.upload_queue.max_concurrent)
+        self.concurrency_spinbox.valueChanged.connect(self.upload_queue.set_max_concurrent)
+
+        self.summary_label = QLabel()
+
+        for button in (self.pause_button, self.resume_button, self.cancel_button, self.up_button, self.down_button, self.clear_button):
+            controls.addWidget(button)
+        controls.addStretch()
+        controls.addWidget(QLabel("Parallel uploads:"))
+        controls.addWidget(self.concurrency_spinbox)
+        layout.addLayout(controls)
+        layout.addWidget(self.summary_label)
+
+        self.upload_queue.queue_changed.connect(self.rebuild)
+        self.upload_queue.task_updated.connect(self.update_task)
+        self.rebuild()
+
+    def _with_selected(self, action):
+        rows = self.table.selectionModel().selectedRows()
+        if rows:
+            task = self.upload_queue.tasks[rows[0].row()]
+            action(task)
+            # Keep the selection on the task if it moved
+            self.table.selectRow(self.upload_queue.tasks.index(task))
+
+    def rebuild(self):
+        self.table.setRowCount(len(self.upload_queue.tasks))
+        for row, task in enumerate(self.upload_queue.tasks):
+            progress_bar = QProgressBar()
+            self.table.setCellWidget(row, 3, progress_bar)
+            self._fill_row(row, task)
+        self.setVisible(bool(self.upload_queue.tasks))
+        self._update_summary()
+
+    def update_task(self, task):
+        self._fill_row(self.upload_queue.tasks.index(task), task)
+        self._update_summary()
+
+    def _fill_row(self, row, task):
+        self.table.setItem(row, 0, QTableWidgetItem(task.dataset_id))
+        self.table.setItem(row, 1, QTableWidgetItem(task.order_id or ""))
+        status_item = QTableWidgetItem(task.state)
+        if task.error and task.state == UploadTask.FAILED:
+            status_item.setToolTip(task.error)
+        elif task.info:
+            status_item.setToolTip(task.info)
+        self.table.setItem(row, 2, status_item)
+        self.table.cellWidget(row, 3).setValue(task.progress)
+        speed = f"{format_bytes(task.bytes_per_sec)}/s" if task.bytes_per_sec else ""
+        self.table.setItem(row, 4, QTableWidgetItem(speed))
+
+    def _update_summary(self):
+        pending = len(self.upload_queue.pending_tasks())
+        percent, bytes_per_sec = self.upload_queue.aggregate()
+        self.summary_label.setText(
+            f"{pending} upload(s) pending - {percent}% - {format_bytes(bytes_per_sec)}/s" if pending else "All uploads finished"
+        )